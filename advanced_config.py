@@ -32,6 +32,9 @@ class AdvancedConfig:
         "burst_time_threshold": 250,  # 连拍时间阈值(ms) (150-500) - 相邻照片时间差小于此值视为连拍
         "burst_min_count": 4,         # 连拍最少张数 (3-10) - 至少此数量连续照片才算连拍组
 
+        # 推理设置
+        "yolo_precision": "fp32",   # YOLO 推理精度: "fp32" | "int8"（int8 需先导出量化模型，缺失时回退 fp32）
+
         # 输出设置
         "save_csv": True,           # 是否保存CSV报告
         "log_level": "detailed",    # 日志详细程度: "simple" | "detailed"
@@ -61,6 +64,8 @@ class AdvancedConfig:
             self.config_file = config_file
 
         self.config = self.DEFAULT_CONFIG.copy()
+        # 配置文件中当前保存的内容（未加载/未保存过时为 None），用于判断是否有未保存的改动
+        self._persisted = None
         self.load()
 
     def load(self):
@@ -71,6 +76,7 @@ class AdvancedConfig:
                     loaded_config = json.load(f)
                     # 合并配置（保留默认值中有但加载配置中没有的项）
                     self.config.update(loaded_config)
+                    self._persisted = loaded_config
                 print(f"✅ 已加载高级配置: {self.config_file}")
             except Exception as e:
                 print(f"⚠️  加载配置失败，使用默认值: {e}")
@@ -80,12 +86,17 @@ class AdvancedConfig:
         try:
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(self.config, f, indent=2, ensure_ascii=False)
+            self._persisted = self.config.copy()
             print(f"✅ 已保存高级配置: {self.config_file}")
             return True
         except Exception as e:
             print(f"❌ 保存配置失败: {e}")
             return False
 
+    def has_unsaved_changes(self):
+        """内存中的配置是否与配置文件中保存的内容不同"""
+        return self.config != self._persisted
+
     def reset_to_default(self):
         """重置为默认配置"""
         self.config = self.DEFAULT_CONFIG.copy()
@@ -121,6 +132,10 @@ class AdvancedConfig:
     def burst_min_count(self):
         return self.config.get("burst_min_count", 4)
 
+    @property
+    def yolo_precision(self):
+        return self.config.get("yolo_precision", "fp32")
+
     @property
     def save_csv(self):
         return self.config["save_csv"]
@@ -164,6 +179,11 @@ class AdvancedConfig:
         """设置连拍最少张数 (3-10)"""
         self.config["burst_min_count"] = max(3, min(10, int(value)))
 
+    def set_yolo_precision(self, value):
+        """设置 YOLO 推理精度 (fp32/int8)"""
+        if value in ["fp32", "int8"]:
+            self.config["yolo_precision"] = value
+
     def set_save_csv(self, value):
         """设置是否保存CSV"""
         self.config["save_csv"] = bool(value)
@@ -178,6 +198,23 @@ class AdvancedConfig:
         if value in ["zh_CN", "en_US"]:
             self.config["language"] = value
 
+    def update(self, **values):
+        """
+        批量设置配置项（逐项经过对应 set_* 方法校验/钳制，不自动保存）
+
+        Example:
+            config.update(min_confidence=0.5, picked_top_percentage=25)
+            config.save()
+        """
+        setters = []
+        for key in values:
+            setter = getattr(self, f"set_{key}", None)
+            if setter is None:
+                raise KeyError(f"未知配置项: {key}")
+            setters.append(setter)
+        for setter, value in zip(setters, values.values()):
+            setter(value)
+
     def get_dict(self):
         """获取配置字典（用于传递给其他模块）"""
         return self.config.copy()
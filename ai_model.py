@@ -1,9 +1,9 @@
 import os
-import time
+import shutil
 import cv2
 import numpy as np
 from ultralytics import YOLO
-from utils import log_message, write_to_csv
+from utils import log_message, write_to_csv, read_exif_orientation, apply_exif_orientation
 from config import config
 # V3.2: 移除未使用的 sharpness 计算器导入
 from iqa_scorer import get_iqa_scorer
@@ -13,8 +13,78 @@ from advanced_config import get_advanced_config
 os.environ['YOLO_VERBOSE'] = 'False'
 
 
-def load_yolo_model():
-    """加载 YOLO 模型（启用MPS GPU加速）"""
+# 已加载的模型（按精度缓存，同一进程内多次处理目录时复用，无需重新加载权重）
+_yolo_models = {}
+
+# 预热推理次数（首次推理会触发内核选择/显存分配，提前在计时循环外完成）
+YOLO_WARMUP_RUNS = 1
+
+
+def _mps_available():
+    """推理设备 MPS 是否可用（run_yolo_batch 先尝试 MPS，失败才用 CPU）"""
+    try:
+        import torch
+        return torch.backends.mps.is_available()
+    except Exception:
+        return False
+
+
+def _warm_up_model(model):
+    """
+    用全零图像做预热推理，消除正式处理时第一张照片的耗时异常
+
+    只在 MPS 上预热：CPU 没有内核编译/显存分配的首次开销，
+    预热只会多跑一次完整推理
+    """
+    if not _mps_available():
+        return
+    size = config.ai.TARGET_IMAGE_SIZE
+    dummy = np.zeros((size, size, 3), dtype=np.uint8)
+    try:
+        for _ in range(YOLO_WARMUP_RUNS):
+            model(dummy, device='mps', classes=[config.ai.BIRD_CLASS_ID], verbose=False)
+    except Exception as mps_error:
+        log_message(f"⚠️  MPS预热失败，跳过预热: {mps_error}")
+
+
+def resolve_yolo_precision(precision: str = "fp32") -> str:
+    """
+    返回实际会加载的精度：请求 int8 但未导出量化模型时为 fp32
+    """
+    if precision == "int8" and os.path.exists(config.ai.get_int8_model_path()):
+        return "int8"
+    return "fp32"
+
+
+def load_yolo_model(precision: str = "fp32"):
+    """
+    加载 YOLO 模型（启用MPS GPU加速）
+
+    Args:
+        precision: "fp32"（默认 .pt 权重）或 "int8"（OpenVINO INT8 量化模型，
+                   需先用 export_int8_model 导出；缺失时回退到 fp32）
+    """
+    loaded_precision = resolve_yolo_precision(precision)
+    if loaded_precision != precision:
+        print(f"⚠️  未找到 INT8 量化模型 ({config.ai.get_int8_model_path()})，回退到 FP32")
+
+    # 按实际加载的精度缓存：回退的 fp32 模型不占用 int8 的位置，之后导出的 INT8 模型仍能被加载
+    if loaded_precision in _yolo_models:
+        return _yolo_models[loaded_precision]
+
+    model = _build_yolo_model(loaded_precision)
+    _warm_up_model(model)
+    _yolo_models[loaded_precision] = model
+    return model
+
+
+def _build_yolo_model(precision: str):
+    """从磁盘构建 YOLO 模型（precision 为已确认可加载的精度）"""
+    if precision == "int8":
+        int8_path = config.ai.get_int8_model_path()
+        print(f"✅ 使用 INT8 量化模型: {int8_path}")
+        return YOLO(str(int8_path), task='segment')
+
     model_path = config.ai.get_model_path()
     model = YOLO(str(model_path))
 
@@ -33,11 +103,106 @@ def load_yolo_model():
     return model
 
 
-def preprocess_image(image_path, target_size=None):
-    """预处理图像"""
+# INT8 相对 FP32 允许的最大 mAP50-95 下降（检测框和分割掩码分别检查）
+INT8_MAX_MAP_DROP = 0.01
+
+
+def _validate_map(model, data):
+    """在校准数据集的验证集上评估，返回 (box mAP50-95, mask mAP50-95)"""
+    metrics = model.val(data=data, imgsz=config.ai.TARGET_IMAGE_SIZE, plots=False, verbose=False)
+    return float(metrics.box.map), float(metrics.seg.map)
+
+
+def export_int8_model(calibration_data: str, fraction: float = 1.0):
+    """
+    导出 INT8 量化模型（OpenVINO，静态量化），并做精度门控
+
+    导出后在 calibration_data 的验证集上分别评估 FP32 和 INT8 模型，
+    任一 mAP50-95 下降超过 INT8_MAX_MAP_DROP 时删除导出结果，不启用 INT8
+
+    Args:
+        calibration_data: 校准数据集 YAML 路径（建议约 200 张有代表性的鸟类照片）
+        fraction: 使用校准数据集的比例
+
+    Returns:
+        导出的模型目录路径；未通过精度门控时返回 None
+    """
+    model = YOLO(str(config.ai.get_model_path()))
+    exported = model.export(
+        format='openvino',
+        int8=True,
+        data=calibration_data,
+        fraction=fraction,
+        imgsz=config.ai.TARGET_IMAGE_SIZE,
+    )
+    # Ultralytics 导出到 <模型名>_int8_openvino_model/，与 INT8_MODEL_DIR 对应
+    print(f"✅ INT8 模型已导出: {exported}")
+
+    fp32_box, fp32_mask = _validate_map(model, calibration_data)
+    int8_box, int8_mask = _validate_map(YOLO(str(exported), task='segment'), calibration_data)
+    print(f"📊 mAP50-95 FP32: box {fp32_box:.4f} / mask {fp32_mask:.4f}，"
+          f"INT8: box {int8_box:.4f} / mask {int8_mask:.4f}")
+
+    if fp32_box - int8_box > INT8_MAX_MAP_DROP or fp32_mask - int8_mask > INT8_MAX_MAP_DROP:
+        print(f"❌ INT8 精度下降超过 {INT8_MAX_MAP_DROP}，已删除导出结果，继续使用 FP32")
+        shutil.rmtree(exported, ignore_errors=True)
+        return None
+
+    # 同一进程内之后请求 int8 时重新加载新导出的模型
+    _yolo_models.pop("int8", None)
+    return exported
+
+
+def _decode_jpeg_cuda(image_path, target_size):
+    """
+    使用 nvJPEG 在 GPU 上解码并缩放 JPEG，返回 BGR numpy 图像
+
+    只有缩放后的小图会拷回内存，解码和缩放都在 GPU 上完成；
+    通道数与 CPU 路径 (cv2.imread) 一致。torchvision 只在 CPU 解码时支持
+    apply_exif_orientation，所以 EXIF 方向在拷回的小图上另行应用
+    """
+    import io
+    import torch
+    import torch.nn.functional as F
+    from torchvision.io import decode_jpeg, ImageReadMode
+
+    with open(image_path, 'rb') as f:
+        raw = f.read()
+    orientation = read_exif_orientation(io.BytesIO(raw))
+    data = torch.frombuffer(bytearray(raw), dtype=torch.uint8)
+    # 灰度/CMYK 统一转成 3 通道
+    img = decode_jpeg(data, mode=ImageReadMode.RGB, device='cuda')
+    if img.ndim != 3 or img.shape[0] != 3:
+        raise ValueError(f"unexpected decoded shape {tuple(img.shape)}")
+    h, w = img.shape[1:]
+    scale = target_size / max(w, h)
+    # area 插值对应 cv2.INTER_AREA
+    resized = F.interpolate(
+        img.unsqueeze(0).float(),
+        size=(int(h * scale), int(w * scale)),
+        mode='area'
+    )
+    rgb = resized[0].round().clamp(0, 255).byte().permute(1, 2, 0)
+    # 缩放与旋转可交换（目标尺寸只取决于长边），在小图上旋转开销可忽略
+    return apply_exif_orientation(rgb.cpu().numpy()[:, :, ::-1], orientation)
+
+
+def preprocess_image(image_path, target_size=None, device='cpu'):
+    """
+    预处理图像
+
+    Args:
+        device: 解码设备，'cuda' 时优先使用 nvJPEG GPU 解码，失败则回退 CPU
+    """
     if target_size is None:
         target_size = config.ai.TARGET_IMAGE_SIZE
-    
+
+    if device == 'cuda':
+        try:
+            return _decode_jpeg_cuda(image_path, target_size)
+        except Exception:
+            pass  # 无 CUDA / torchvision 不支持时回退到 CPU 解码
+
     img = cv2.imread(image_path)
     h, w = img.shape[:2]
     scale = target_size / max(w, h)
@@ -59,36 +224,16 @@ def _get_iqa_scorer():
     return _iqa_scorer
 
 
-def detect_and_draw_birds(image_path, model, output_path, dir, ui_settings, i18n=None, skip_nima=False):
+def decode_image(image_path, dir, device='cpu'):
     """
-    检测并标记鸟类（V3.1 - 简化版，移除预览功能）
+    解码并预处理单张图片（可在线程池中并行调用）
 
     Args:
-        image_path: 图片路径
-        model: YOLO模型
-        output_path: 输出路径（带框图片）
-        dir: 工作目录
-        ui_settings: [ai_confidence, sharpness_threshold, nima_threshold, save_crop, normalization_mode]
-        i18n: I18n instance for internationalization (optional)
-        skip_nima: 如果为True，跳过NIMA计算（用于双眼不可见的情况）
-    """
-    # V3.1: 从 ui_settings 获取参数
-    ai_confidence = ui_settings[0] / 100  # AI置信度：50-100 -> 0.5-1.0（仅用于过滤）
-    sharpness_threshold = ui_settings[1]  # 锐度阈值：6000-9000
-    nima_threshold = ui_settings[2]       # NIMA美学阈值：5.0-6.0
-
-    # V3.1: 不再保存Crop图片（移除预览功能）
-    save_crop = False
-
-    # V3.2: 移除未使用的 normalization_mode 和 sharpness_calculator
-    # 锐度现在由 photo_processor 中的 keypoint_detector 计算
-
-    found_bird = False
-    bird_sharp = False
-    bird_result = False
-    nima_score = None  # 美学评分
-    # V3.2: 移除 BRISQUE（不再使用）
+        device: 解码设备 ('cpu' | 'cuda')
 
+    Returns:
+        缩放后的 BGR 图像；文件类型不符或不存在时返回 None
+    """
     # 使用配置检查文件类型
     if not config.is_jpg_file(image_path):
         log_message("ERROR: not a jpg file", dir)
@@ -98,199 +243,176 @@ def detect_and_draw_birds(image_path, model, output_path, dir, ui_settings, i18n
         log_message(f"ERROR: in detect_and_draw_birds, {image_path} not found", dir)
         return None
 
-    # 记录总处理开始时间
-    total_start = time.time()
+    return preprocess_image(image_path, device=device)
 
-    # Step 1: 图像预处理
-    step_start = time.time()
-    image = preprocess_image(image_path)
-    height, width, _ = image.shape
-    preprocess_time = (time.time() - step_start) * 1000
-    # V3.3: 简化日志，移除步骤详情
-    # log_message(f"  ⏱️  [1/4] 图像预处理: {preprocess_time:.1f}ms", dir)
 
-    # Step 2: YOLO推理
-    step_start = time.time()
+def yolo_batch_limit(precision: str):
+    """
+    模型单次推理可接受的最大图片数（None 表示不限）
+
+    INT8 模型是 OpenVINO 静态图（导出时输入固定为 1×3×H×W），一次只能推理一张；
+    这类后端的 model.val 和预热都按单张运行，不会暴露批量输入的形状不匹配
+    """
+    return 1 if precision == "int8" else None
+
+
+def run_yolo_batch(model, images, dir, max_batch=None):
+    """
+    批量 YOLO 推理（一次前向传播处理多张图片）
+
+    Args:
+        model: YOLO模型
+        images: 预处理后的图像列表
+        dir: 工作目录（用于日志）
+        max_batch: 单次前向传播的最大图片数（见 yolo_batch_limit），超出时分段推理
+
+    Returns:
+        Results 列表（与 images 一一对应）；MPS 和 CPU 都失败时返回 None
+    """
+    if max_batch is not None and len(images) > max_batch:
+        results = []
+        for start in range(0, len(images), max_batch):
+            chunk = run_yolo_batch(model, images[start:start + max_batch], dir)
+            if chunk is None:
+                return None
+            results.extend(chunk)
+        return results
+
     # 使用MPS设备进行推理（如果可用），失败时降级到CPU
     try:
-        # 尝试使用MPS设备
-        results = model(image, device='mps')
+        # 尝试使用MPS设备（只保留鸟类，非鸟框在 NMS 前即被过滤）
+        return model(images, device='mps', classes=[config.ai.BIRD_CLASS_ID])
     except Exception as mps_error:
         # MPS失败，降级到CPU
         log_message(f"⚠️  MPS推理失败，降级到CPU: {mps_error}", dir)
         try:
-            results = model(image, device='cpu')
+            return model(images, device='cpu', classes=[config.ai.BIRD_CLASS_ID])
         except Exception as cpu_error:
             log_message(f"❌ AI推理完全失败: {cpu_error}", dir)
-            # 返回"无鸟"结果（V3.1）
-            # V3.3: 使用英文列名
-            data = {
-                "filename": os.path.splitext(os.path.basename(image_path))[0],
-                "has_bird": "no",
-                "confidence": 0.0,
-                "head_sharp": "-",
-                "left_eye": "-",
-                "right_eye": "-",
-                "beak": "-",
-                "nima_score": "-",
-                "rating": -1
-            }
-            write_to_csv(data, dir, False)
-            return found_bird, bird_result, 0.0, 0.0, None, None, None, None  # V3.7: 8 values including mask
-
-    yolo_time = (time.time() - step_start) * 1000
-    # V3.3: 简化日志，移除步骤详情
-    # if i18n:
-    #     log_message(i18n.t("logs.yolo_inference", time=yolo_time), dir)
-    # else:
-    #     log_message(f"  ⏱️  [2/4] YOLO推理: {yolo_time:.1f}ms", dir)
-
-    # Step 3: 解析检测结果
-    step_start = time.time()
-    detections = results[0].boxes.xyxy.cpu().numpy()
-    confidences = results[0].boxes.conf.cpu().numpy()
-    class_ids = results[0].boxes.cls.cpu().numpy()
-
-    # 获取掩码数据（如果是分割模型）
-    masks = None
-    if hasattr(results[0], 'masks') and results[0].masks is not None:
-        masks = results[0].masks.data.cpu().numpy()
-
-    # 只处理置信度最高的鸟
-    bird_idx = -1
-    max_conf = 0
-
-    for idx, (detection, conf, class_id) in enumerate(zip(detections, confidences, class_ids)):
-        if int(class_id) == config.ai.BIRD_CLASS_ID:
-            if conf > max_conf:
-                max_conf = conf
-                bird_idx = idx
-
-    parse_time = (time.time() - step_start) * 1000
-    # V3.3: 简化日志，移除步骤详情
-    # if i18n:
-    #     log_message(i18n.t("logs.result_parsing", time=parse_time), dir)
-    # else:
-    #     log_message(f"  ⏱️  [3/4] 结果解析: {parse_time:.1f}ms", dir)
-
-    # 如果没有找到鸟，记录到CSV并返回（V3.1）
-    if bird_idx == -1:
-        # V3.3: 使用英文列名
-        data = {
-            "filename": os.path.splitext(os.path.basename(image_path))[0],
-            "has_bird": "no",
-            "confidence": 0.0,
-            "head_sharp": "-",
-            "left_eye": "-",
-            "right_eye": "-",
-            "beak": "-",
-            "nima_score": "-",
-            "rating": -1
-        }
-        write_to_csv(data, dir, False)
-        return found_bird, bird_result, 0.0, 0.0, None, None, None, None  # V3.7: 8 values including mask
+            return None
+
+
+def record_no_bird(image_path, dir):
+    """记录"无鸟"结果到CSV，返回对应的检测结果元组（V3.1）"""
+    # V3.3: 使用英文列名
+    data = {
+        "filename": os.path.splitext(os.path.basename(image_path))[0],
+        "has_bird": "no",
+        "confidence": 0.0,
+        "head_sharp": "-",
+        "left_eye": "-",
+        "right_eye": "-",
+        "beak": "-",
+        "nima_score": "-",
+        "rating": -1
+    }
+    write_to_csv(data, dir, False)
+    return False, False, 0.0, 0.0, None, None, None, None  # V3.7: 8 values including mask
+
+
+def unletterbox_mask(raw_mask, height, width):
+    """
+    将 YOLO 掩码还原到输入图像尺寸（同 ultralytics.utils.ops.scale_image）
+
+    批量推理时形状不同的图片（横竖混排、不同机身）会被 letterbox 到同一画布，
+    masks.data 是含居中灰边的画布分辨率；直接 resize 会把灰边拉伸进图像，
+    导致掩码相对照片偏移/压扁。这里先按 letterbox 比例裁掉灰边，再缩放
+
+    Args:
+        raw_mask: (H', W') 画布分辨率的掩码
+        height, width: 输入图像尺寸
+
+    Returns:
+        (height, width) 掩码
+    """
+    mask_h, mask_w = raw_mask.shape[:2]
+    if (mask_h, mask_w) == (height, width):
+        return raw_mask
+
+    gain = min(mask_h / height, mask_w / width)
+    pad_h = (mask_h - height * gain) / 2
+    pad_w = (mask_w - width * gain) / 2
+    top, left = int(round(pad_h - 0.1)), int(round(pad_w - 0.1))
+    bottom, right = int(round(mask_h - pad_h + 0.1)), int(round(mask_w - pad_w + 0.1))
+    cropped = np.ascontiguousarray(raw_mask[top:bottom, left:right])
+    return cv2.resize(cropped, (width, height), interpolation=cv2.INTER_NEAREST)
+
+
+def parse_yolo_result(image_path, image, result, dir):
+    """
+    解析单张图片的 YOLO 结果：选取置信度最高的鸟，写入 CSV，提取 bbox 和分割掩码
+
+    Args:
+        image_path: 图片路径
+        image: 预处理后的图像（会在其上绘制检测框）
+        result: 该图片对应的 YOLO Results
+        dir: 工作目录
+
+    Returns:
+        (found_bird, bird_result, AI置信度, 归一化锐度, NIMA分数, bbox, 图像尺寸, 分割掩码)
+    """
+    found_bird = False
+    bird_result = False
+    height, width, _ = image.shape
+
+    # Step 3: 解析检测结果（整数组 NumPy 运算，不逐框循环）
+    detections = result.boxes.xyxy.cpu().numpy()
+    confidences = result.boxes.conf.cpu().numpy()
+    class_ids = result.boxes.cls.cpu().numpy()
+
+    # 只处理置信度最高的鸟：布尔掩码筛出鸟类，再一次 argmax
+    bird_indices = np.flatnonzero(class_ids.astype(np.int64) == config.ai.BIRD_CLASS_ID)
+    if bird_indices.size == 0 or confidences[bird_indices].max() <= 0:
+        # 如果没有找到鸟，记录到CSV并返回（V3.1）
+        return record_no_bird(image_path, dir)
+    bird_idx = int(bird_indices[np.argmax(confidences[bird_indices])])
+    conf = confidences[bird_idx]
+
     # V3.2: 移除 NIMA 计算（现在由 photo_processor 在裁剪区域上计算）
     # nima_score 设为 None，photo_processor 会重新计算
     nima_score = None
-    
-    # V3.9.3: 提前声明默认值，避免 continue 后变量未定义
+
+    # V3.2: 锐度现在由 photo_processor 中的 keypoint_detector 计算 head_sharpness
+    # 设置占位值以保持 CSV 兼容性
     sharpness = 0.0
-    x, y, w, h = 0, 0, 0, 0
-
-    # 只处理面积最大的那只鸟
-    for idx, (detection, conf, class_id) in enumerate(zip(detections, confidences, class_ids)):
-        # 跳过非鸟类或非最大面积的鸟
-        if idx != bird_idx:
-            continue
-        x1, y1, x2, y2 = detection
-
-        x = int(x1)
-        y = int(y1)
-        w = int(x2 - x1)
-        h = int(y2 - y1)
-        class_id = int(class_id)
-
-        # 使用配置中的鸟类类别 ID
-        if class_id == config.ai.BIRD_CLASS_ID:
-            found_bird = True
-            area_ratio = (w * h) / (width * height)
-            filename = os.path.basename(image_path)
-
-            # V3.1: 不再保存Crop图片
-            crop_path = None
-
-            x = max(0, min(x, width - 1))
-            y = max(0, min(y, height - 1))
-            w = min(w, width - x)
-            h = min(h, height - y)
-
-            if w <= 0 or h <= 0:
-                log_message(f"ERROR: Invalid crop region for {image_path}", dir)
-                continue
-
-            crop_img = image[y:y + h, x:x + w]
-
-            if crop_img is None or crop_img.size == 0:
-                log_message(f"ERROR: Crop image is empty for {image_path}", dir)
-                continue
-
-            # V3.2: 移除 Step 5 锐度计算（现在由 photo_processor 中的 keypoint_detector 计算 head_sharpness）
-            # 设置占位值以保持 CSV 兼容性
-            real_sharpness = 0.0
-            sharpness = 0.0
-            effective_pixels = 0
-
-            # V3.2: 移除 BRISQUE 评估（不再使用）
-
-            cv2.rectangle(image, (x, y), (x + w, y + h), (0, 0, 255), 2)
-
-            # V3.1: 新的评分逻辑
-            # 计算中心坐标（仅用于日志输出）
-            center_x = (x + w / 2) / width
-            center_y = (y + h / 2) / height
-
-            # V3.3: 简化日志，移除AI详情输出
-            # log_message(f" AI: {conf:.2f} - Class: {class_id} "
-            #             f"- Area:{area_ratio * 100:.2f}% - Pixels:{effective_pixels:,d}"
-            #             f" - Center_x:{center_x:.2f} - Center_y:{center_y:.2f}", dir)
-
-            # V3.2: 移除评分逻辑（现在由 photo_processor 的 RatingEngine 计算）
-            # rating_value 设为占位值，photo_processor 会重新计算
-            rating_value = 0
-
-            # V3.3: 使用英文列名
-            data = {
-                "filename": os.path.splitext(os.path.basename(image_path))[0],
-                "has_bird": "yes" if found_bird else "no",
-                "confidence": float(f"{conf:.2f}"),
-                "head_sharp": "-",        # 将由 photo_processor 填充
-                "left_eye": "-",          # 将由 photo_processor 填充
-                "right_eye": "-",         # 将由 photo_processor 填充
-                "beak": "-",              # 将由 photo_processor 填充
-                "nima_score": float(f"{nima_score:.2f}") if nima_score is not None else "-",
-                "rating": rating_value
-            }
-
-            # Step 5: CSV写入
-            step_start = time.time()
-            write_to_csv(data, dir, False)
-            csv_time = (time.time() - step_start) * 1000
-            # V3.3: 简化日志
-            # log_message(f"  ⏱️  [4/4] CSV写入: {csv_time:.1f}ms", dir)
-
-    # --- 修改开始 ---
-    # 只有在 found_bird 为 True 且 output_path 有效时，才保存带框的图片
-    if found_bird and output_path:
-        cv2.imwrite(output_path, image)
-    # --- 修改结束 ---
 
-    # 计算总处理时间 (V3.3: 移除此处日志, 由 photo_processor 输出真正总耗时)
-    total_time = (time.time() - total_start) * 1000
-    # log_message(f"  ⏱️  ========== 总耗时: {total_time:.1f}ms ==========", dir)
+    x1, y1, x2, y2 = detections[bird_idx]
+    x = max(0, min(int(x1), width - 1))
+    y = max(0, min(int(y1), height - 1))
+    w = min(int(x2 - x1), width - x)
+    h = min(int(y2 - y1), height - y)
+    found_bird = True
+
+    if w <= 0 or h <= 0:
+        log_message(f"ERROR: Invalid crop region for {image_path}", dir)
+    elif image[y:y + h, x:x + w].size == 0:
+        log_message(f"ERROR: Crop image is empty for {image_path}", dir)
+    else:
+        cv2.rectangle(image, (x, y), (x + w, y + h), (0, 0, 255), 2)
+
+        # V3.2: 移除评分逻辑（现在由 photo_processor 的 RatingEngine 计算）
+        # rating_value 设为占位值，photo_processor 会重新计算
+        rating_value = 0
+
+        # V3.3: 使用英文列名
+        data = {
+            "filename": os.path.splitext(os.path.basename(image_path))[0],
+            "has_bird": "yes",
+            "confidence": float(f"{conf:.2f}"),
+            "head_sharp": "-",        # 将由 photo_processor 填充
+            "left_eye": "-",          # 将由 photo_processor 填充
+            "right_eye": "-",         # 将由 photo_processor 填充
+            "beak": "-",              # 将由 photo_processor 填充
+            "nima_score": float(f"{nima_score:.2f}") if nima_score is not None else "-",
+            "rating": rating_value
+        }
+
+        # Step 5: CSV写入
+        write_to_csv(data, dir, False)
 
     # 返回 found_bird, bird_result, AI置信度, 归一化锐度, NIMA分数, bbox, 图像尺寸, 分割掩码
-    bird_confidence = float(confidences[bird_idx]) if bird_idx != -1 else 0.0
-    bird_sharpness = sharpness if bird_idx != -1 else 0.0
+    bird_confidence = float(confidences[bird_idx])
+    bird_sharpness = sharpness
     # bbox 格式: (x, y, w, h) - 在缩放后的图像上
     # img_dims 格式: (width, height) - 缩放后图像的尺寸，用于计算缩放比例
     bird_bbox = (x, y, w, h) if found_bird else None
@@ -298,22 +420,13 @@ def detect_and_draw_birds(image_path, model, output_path, dir, ui_settings, i18n
     
     # 获取对应鸟的掩码
     bird_mask = None
-    if found_bird and masks is not None:
-        # masks shape: (N, H, W) where N is number of detections
-        # YOLO masks are usually same size as input image (or smaller and upscaled)
-        # Ultralytics results.masks.data is usually (N, H, W) 
-        # But we need to be careful about resizing if it's smaller
-        # results.masks.data contains masks for all detections
-        # We need the one corresponding to bird_idx
+    if found_bird and getattr(result, 'masks', None) is not None:
+        # result.masks.data 为 (N, H, W)，取 bird_idx 对应的掩码
         try:
-            # Mask is already resized to image size by ultralytics by default in modern versions
-            # But let's verify if we need to resize
-            # results[0].masks.data is a torch tensor on GPU/CPU
-            raw_mask = results[0].masks.data[bird_idx].cpu().numpy()
+            raw_mask = result.masks.data[bird_idx].cpu().numpy()
             
-            # Ensure mask is same size as processed image (width, height)
-            if raw_mask.shape != (height, width):
-                raw_mask = cv2.resize(raw_mask, (width, height), interpolation=cv2.INTER_NEAREST)
+            # 掩码是 letterbox 画布分辨率，去掉灰边后还原到处理图像尺寸 (width, height)
+            raw_mask = unletterbox_mask(raw_mask, height, width)
             
             # Convert to binary uint8 mask (0 or 255)
             # YOLO masks are float [0,1], threshold at 0.5
@@ -322,4 +435,40 @@ def detect_and_draw_birds(image_path, model, output_path, dir, ui_settings, i18n
             # Mask processing failed, ignore
             pass
 
-    return found_bird, bird_result, bird_confidence, bird_sharpness, nima_score, bird_bbox, img_dims, bird_mask
\ No newline at end of file
+    return found_bird, bird_result, bird_confidence, bird_sharpness, nima_score, bird_bbox, img_dims, bird_mask
+
+
+def detect_and_draw_birds(image_path, model, output_path, dir, ui_settings, i18n=None, skip_nima=False):
+    """
+    检测并标记鸟类（V3.1 - 简化版，移除预览功能）
+
+    单张图片版本：decode_image → run_yolo_batch → parse_yolo_result
+    批量处理请直接组合这三个函数（见 PhotoProcessor._iter_detections）
+
+    Args:
+        image_path: 图片路径
+        model: YOLO模型
+        output_path: 输出路径（带框图片）
+        dir: 工作目录
+        ui_settings: [ai_confidence, sharpness_threshold, nima_threshold, save_crop, normalization_mode]
+        i18n: I18n instance for internationalization (optional)
+        skip_nima: 如果为True，跳过NIMA计算（用于双眼不可见的情况）
+    """
+    # Step 1: 图像预处理
+    image = decode_image(image_path, dir)
+    if image is None:
+        return None
+
+    # Step 2: YOLO推理
+    results = run_yolo_batch(model, image, dir)
+    if results is None:
+        # 返回"无鸟"结果（V3.1）
+        return record_no_bird(image_path, dir)
+
+    result = parse_yolo_result(image_path, image, results[0], dir)
+
+    # 只有在 found_bird 为 True 且 output_path 有效时，才保存带框的图片
+    if result[0] and output_path:
+        cv2.imwrite(output_path, image)
+
+    return result
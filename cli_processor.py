@@ -15,10 +15,26 @@ from core.photo_processor import (
 from utils import log_message
 
 
+# ANSI颜色代码
+_COLORS = {
+    "success": "\033[92m",  # 绿色
+    "error": "\033[91m",    # 红色
+    "warning": "\033[93m",  # 黄色
+    "info": "\033[94m",     # 蓝色
+}
+_RESET = "\033[0m"
+
+
+def _noop(*args, **kwargs):
+    """静默模式下的日志回调"""
+    pass
+
+
 class CLIProcessor:
     """CLI 处理器 - 只负责命令行交互"""
     
-    def __init__(self, dir_path: str, ui_settings: List = None, verbose: bool = True, detect_flight: bool = True):
+    def __init__(self, dir_path: str, ui_settings: List = None, verbose: bool = True, detect_flight: bool = True,
+                 decode_device: str = 'cpu'):
         """
         初始化处理器
         
@@ -27,9 +43,12 @@ class CLIProcessor:
             ui_settings: [ai_confidence, sharpness_threshold, nima_threshold, save_crop, norm_mode]
             verbose: 详细输出
             detect_flight: 是否启用飞鸟检测
+            decode_device: JPEG 解码设备 ('cpu' | 'cuda')
         """
         self.verbose = verbose
         self.dir_path = dir_path  # 保存目录路径用于日志
+        # 非详细模式直接换成空函数，热路径上不再逐次判断 verbose
+        self._log = self._log_verbose if verbose else _noop
         
         # V3.9.4: 修正默认值，与 GUI 保持完全一致
         # GUI 默认: sharpness=400, nima=5.0, exposure=True, burst=True
@@ -45,7 +64,8 @@ class CLIProcessor:
             normalization_mode=ui_settings[4] if len(ui_settings) > 4 else 'log_compression',
             detect_flight=detect_flight,
             detect_exposure=True,   # V3.9.4: 默认开启曝光检测，与 GUI 一致
-            detect_burst=True       # V3.9.4: 默认开启连拍检测，与 GUI 一致
+            detect_burst=True,      # V3.9.4: 默认开启连拍检测，与 GUI 一致
+            decode_device=decode_device
         )
         
         # 创建核心处理器
@@ -53,30 +73,20 @@ class CLIProcessor:
             dir_path=dir_path,
             settings=settings,
             callbacks=ProcessingCallbacks(
-                log=self._log,
+                log=self._log if verbose else None,  # None: 核心处理器直接跳过日志回调
                 progress=self._progress
             )
         )
     
-    def _log(self, msg: str, level: str = "info"):
+    def _log_verbose(self, msg: str, level: str = "info"):
         """日志回调 - 带颜色输出并写入文件"""
-        if not self.verbose:
-            return
-        
-        # ANSI颜色代码
-        colors = {
-            "success": "\033[92m",  # 绿色
-            "error": "\033[91m",    # 红色
-            "warning": "\033[93m",  # 黄色
-            "info": "\033[94m",     # 蓝色
-            "reset": "\033[0m"
-        }
-        
-        color = colors.get(level, "")
-        reset = colors["reset"] if color else ""
+        color = _COLORS.get(level)
         
         # 输出到终端（带颜色）
-        print(f"{color}{msg}{reset}")
+        if color:
+            print(color + msg + _RESET)
+        else:
+            print(msg)
         
         # 同时写入日志文件（不带颜色，不重复打印）
         log_message(msg, self.dir_path, file_only=True)
@@ -55,9 +55,11 @@ class DirectoryConfig:
 class AIConfig:
     """AI 模型相关配置"""
     MODEL_FILE: str = "models/yolo11l-seg.pt"  # 使用 yolo11l-seg 分割模型（已打包）
+    INT8_MODEL_DIR: str = "models/yolo11l-seg_int8_openvino_model"  # INT8 量化模型（OpenVINO 导出，可选）
     BIRD_CLASS_ID: int = 14              # YOLO 模型中鸟类的类别 ID
     TARGET_IMAGE_SIZE: int = 1024        # 图像预处理目标尺寸（保持1024以维持锐度值一致性）
     CENTER_THRESHOLD: float = 0.15       # 鸟类位置中心阈值
+    YOLO_BATCH_SIZE: int = 8             # YOLO 批量推理张数（解码预取窗口为其 2 倍）
 
     # 锐度计算配置
     SHARPNESS_NORMALIZATION: str = None  # 锐度归一化方法：None(推荐), 'sqrt', 'linear', 'log', 'gentle'
@@ -66,6 +68,10 @@ class AIConfig:
         """获取模型文件完整路径"""
         return resource_path(self.MODEL_FILE)
 
+    def get_int8_model_path(self) -> str:
+        """获取 INT8 量化模型目录完整路径"""
+        return resource_path(self.INT8_MODEL_DIR)
+
 
 @dataclass
 class UIConfig:
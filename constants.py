@@ -23,6 +23,10 @@ RAW_EXTENSIONS = ['.nef', '.cr2', '.cr3', '.arw', '.raf', '.orf', '.rw2', '.pef'
 # 支持的 JPG 文件扩展名（小写）
 JPG_EXTENSIONS = ['.jpg', '.jpeg']
 
+# 扩展名查找集合（小写，用于 O(1) 成员判断）
+RAW_EXTENSION_SET = frozenset(RAW_EXTENSIONS)
+JPG_EXTENSION_SET = frozenset(JPG_EXTENSIONS)
+
 # 所有支持的图片扩展名（用于文件查找，包含大小写）
 IMAGE_EXTENSIONS = (
     [ext.lower() for ext in RAW_EXTENSIONS] +
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IO Backend - 批量文件操作后端
+文件整理阶段的批量移动和临时文件清理
+
+线程池并行移动：优先单次"不覆盖重命名"系统调用
+（Linux renameat2 / macOS renamex_np / Windows rename），
+目标已存在由内核直接报 EEXIST，无需先 stat 目标
+
+跨设备移动（EXDEV）或文件系统不支持时自动回退到 shutil.move
+"""
+
+import ctypes
+import errno
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+# 线程池并发数（移动/删除是系统调用密集型，线程并行即可压缩耗时）
+IO_MAX_WORKERS = 8
+
+# renameat2 标志：目标已存在时失败（EEXIST），与"目标存在则跳过"语义一致
+RENAME_NOREPLACE = 1
+# macOS renamex_np 的同义标志
+RENAME_EXCL = 0x00000004
+AT_FDCWD = -100
+
+# 移动结果状态
+MOVE_OK = "moved"
+MOVE_EXISTS = "exists"
+MOVE_FAILED = "failed"
+
+# 删除结果状态
+REMOVE_OK = "removed"
+REMOVE_MISSING = "missing"
+REMOVE_FAILED = "failed"
+
+MoveResult = Tuple[str, Optional[str]]  # (状态, 错误信息)
+
+
+_rename_noreplace_fn = None
+_rename_noreplace_checked = False
+
+
+def _get_rename_noreplace():
+    """
+    获取"不覆盖重命名"函数 fn(src_bytes, dst_bytes) -> 0 / -1（errno 见 ctypes.get_errno）
+
+    POSIX 的 os.rename 会静默覆盖目标，不能用来替代"目标存在则跳过"，
+    因此 Linux 用 glibc renameat2(RENAME_NOREPLACE)，macOS 用 renamex_np(RENAME_EXCL)
+    不可用时返回 None
+    """
+    global _rename_noreplace_fn, _rename_noreplace_checked
+    if not _rename_noreplace_checked:
+        _rename_noreplace_checked = True
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            if sys.platform.startswith('linux'):
+                renameat2 = libc.renameat2
+                renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+                _rename_noreplace_fn = lambda src, dst: renameat2(AT_FDCWD, src, AT_FDCWD, dst, RENAME_NOREPLACE)
+            elif sys.platform == 'darwin':
+                renamex_np = libc.renamex_np
+                renamex_np.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint]
+                _rename_noreplace_fn = lambda src, dst: renamex_np(src, dst, RENAME_EXCL)
+        except (OSError, AttributeError):
+            _rename_noreplace_fn = None
+    return _rename_noreplace_fn
+
+
+def _rename_move(src: str, dst: str) -> Optional[MoveResult]:
+    """
+    单次系统调用完成移动（目标存在时由内核报 EEXIST）
+
+    Returns:
+        移动结果；跨设备或平台/文件系统不支持时返回 None，由调用方回退到 shutil.move
+    """
+    if os.name == 'nt':
+        # Windows 的 rename 在目标存在时本身就会失败
+        try:
+            os.rename(src, dst)
+            return MOVE_OK, None
+        except FileExistsError:
+            return MOVE_EXISTS, None
+        except OSError:
+            return None
+
+    rename_noreplace = _get_rename_noreplace()
+    if rename_noreplace is None:
+        return None
+    if rename_noreplace(os.fsencode(src), os.fsencode(dst)) == 0:
+        return MOVE_OK, None
+    err = ctypes.get_errno()
+    if err == errno.EEXIST:
+        return MOVE_EXISTS, None
+    if err in (errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTSUP):
+        # 跨设备或文件系统不支持 RENAME_NOREPLACE
+        return None
+    return MOVE_FAILED, os.strerror(err)
+
+
+def _shutil_move(src: str, dst: str) -> MoveResult:
+    """回退路径：目标存在则跳过，否则 shutil.move"""
+    try:
+        if os.path.exists(dst):
+            return MOVE_EXISTS, None
+        shutil.move(src, dst)
+        return MOVE_OK, None
+    except Exception as e:
+        return MOVE_FAILED, str(e)
+
+
+def _move_one(src: str, dst: str) -> MoveResult:
+    """先尝试不覆盖重命名（try-then-fallback，不做预先 stat），失败再 shutil.move"""
+    result = _rename_move(src, dst)
+    if result is None:
+        result = _shutil_move(src, dst)
+    return result
+
+
+def move_files(tasks: List[Tuple[str, str]]) -> List[MoveResult]:
+    """
+    线程池批量移动文件（目标已存在的文件跳过）
+
+    Args:
+        tasks: [(源路径, 目标路径), ...]
+
+    Returns:
+        与 tasks 一一对应的 [(状态, 错误信息), ...]
+        状态为 MOVE_OK / MOVE_EXISTS / MOVE_FAILED
+    """
+    if len(tasks) <= 1:
+        return [_move_one(src, dst) for src, dst in tasks]
+    with ThreadPoolExecutor(max_workers=min(IO_MAX_WORKERS, len(tasks))) as executor:
+        return list(executor.map(lambda task: _move_one(*task), tasks))
+
+
+def _safe_remove(path: str) -> MoveResult:
+    """删除单个文件，不存在视为 REMOVE_MISSING"""
+    try:
+        os.remove(path)
+        return REMOVE_OK, None
+    except FileNotFoundError:
+        return REMOVE_MISSING, None
+    except Exception as e:
+        return REMOVE_FAILED, str(e)
+
+
+def remove_files(paths: List[str]) -> List[MoveResult]:
+    """
+    线程池并行删除文件
+
+    Returns:
+        与 paths 一一对应的 [(状态, 错误信息), ...]
+        状态为 REMOVE_OK / REMOVE_MISSING / REMOVE_FAILED
+    """
+    if len(paths) <= 1:
+        return [_safe_remove(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(IO_MAX_WORKERS, len(paths))) as executor:
+        return list(executor.map(_safe_remove, paths))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Photo Batch - 逐张照片评分数据（SoA）
+供 PhotoProcessor 在处理阶段按序号填充，处理结束后用于精选旗标计算
+
+精选排名与旧版 sorted(..., reverse=True) 的结果一致：
+分数用 float64 保存，并列值按处理序号（输入顺序）先后取
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def top_k_positions(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    降序取前 k 个元素的位置（O(N)，不做全排序）
+
+    等价于稳定降序排序后取前 k 个：严格大于第 k 大值的全部入选，
+    与第 k 大值并列的按位置先后补足，同一输入每次结果相同
+
+    Returns:
+        升序排列的位置数组
+    """
+    n = len(values)
+    if k >= n:
+        return np.arange(n)
+    if k <= 0:
+        return np.arange(0)
+    kth = np.partition(values, n - k)[n - k]  # 第 k 大的值
+    above = np.flatnonzero(values > kth)
+    ties = np.flatnonzero(values == kth)[:k - len(above)]
+    return np.union1d(above, ties)
+
+
+@dataclass
+class PhotoBatch:
+    """
+    逐张照片评分数据（SoA：每个字段一条连续数组，按处理序号索引）
+    
+    相比每张照片一个小 dict，内存更紧凑，下游聚合（精选排名等）可直接向量化
+    """
+    files: List[Optional[str]]
+    nima: np.ndarray        # 调整后美学，NaN 表示无美学分数
+    sharpness: np.ndarray   # 调整后锐度
+    confidence: np.ndarray  # AI 置信度
+    rating: np.ndarray      # 星级，RATING_UNSET 表示未处理/处理失败
+    
+    RATING_UNSET = -2
+    
+    @classmethod
+    def allocate(cls, size: int) -> 'PhotoBatch':
+        """按照片总数预分配（分数用 float64，与 Python float 精度一致，排名不会因截断而并列）"""
+        return cls(
+            files=[None] * size,
+            nima=np.full(size, np.nan, dtype=np.float64),
+            sharpness=np.zeros(size, dtype=np.float64),
+            confidence=np.zeros(size, dtype=np.float64),
+            rating=np.full(size, cls.RATING_UNSET, dtype=np.int8),
+        )
+    
+    def __len__(self) -> int:
+        return len(self.files)
+    
+    def star_3_indices(self) -> np.ndarray:
+        """有美学分数的3星照片索引（精选候选）"""
+        return np.flatnonzero((self.rating == 3) & ~np.isnan(self.nima))
+    
+    def star_3_dicts(self) -> List[Dict]:
+        """3星照片列表（兼容 ProcessingResult.star_3_photos 旧格式）"""
+        return [
+            {'file': self.files[i], 'nima': float(self.nima[i]), 'sharpness': float(self.sharpness[i])}
+            for i in self.star_3_indices().tolist()
+        ]
+    
+    def picked_indices(self, top_count: int) -> np.ndarray:
+        """
+        精选照片索引：3星照片中美学 Top-K 与锐度 Top-K 的交集
+        
+        Args:
+            top_count: K（每项排名入选的张数）
+        """
+        star_3_idx = self.star_3_indices()
+        top_nima = top_k_positions(self.nima[star_3_idx], top_count)
+        top_sharp = top_k_positions(self.sharpness[star_3_idx], top_count)
+        return star_3_idx[np.intersect1d(top_nima, top_sharp, assume_unique=True)]
@@ -15,17 +15,27 @@ Core Photo Processor - 核心照片处理器
 import os
 import time
 import json
-import shutil
 import numpy as np
+from collections import deque
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, List, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
+try:
+    import orjson  # 可选依赖：更快的 JSON 序列化
+except ImportError:
+    orjson = None
+
 # 现有模块
-from find_bird_util import raw_to_jpeg
-from ai_model import load_yolo_model, detect_and_draw_birds
+from find_bird_util import convert_raw_task
+from ai_model import (
+    load_yolo_model, resolve_yolo_precision, yolo_batch_limit,
+    decode_image, run_yolo_batch, parse_yolo_result, record_no_bird
+)
+from config import config as app_config
 from exiftool_manager import get_exiftool_manager
 from advanced_config import get_advanced_config
 from core.rating_engine import RatingEngine, create_rating_engine_from_config
@@ -33,8 +43,17 @@ from core.keypoint_detector import KeypointDetector, get_keypoint_detector
 from core.flight_detector import FlightDetector, get_flight_detector, FlightResult
 from core.exposure_detector import ExposureDetector, get_exposure_detector, ExposureResult
 from core.focus_point_detector import get_focus_detector, verify_focus_in_bbox
+from core.photo_batch import PhotoBatch
+from core.io_backend import move_files, remove_files, MOVE_OK, MOVE_FAILED, REMOVE_OK, REMOVE_FAILED
+
+from constants import RATING_FOLDER_NAMES, RAW_EXTENSION_SET, JPG_EXTENSION_SET
+
+# EXIF 批量写入时每次 exiftool 调用包含的文件数（避免命令行过长）
+EXIF_BATCH_SIZE = 64
 
-from constants import RATING_FOLDER_NAMES, RAW_EXTENSIONS, JPG_EXTENSIONS
+# RAW 转换进程池上限：spawn 模式下每个子进程都要重新导入模块、各占一份内存，
+# 核心数很多（10-16 核 Mac）时启动开销和内存会抵消并行收益
+RAW_CONVERT_MAX_WORKERS = 4
 
 
 @dataclass
@@ -49,6 +68,7 @@ class ProcessingSettings:
     detect_exposure: bool = True     # V3.9.4: 曝光检测开关（默认开启，与 GUI 一致）
     exposure_threshold: float = 0.10 # V3.8: 曝光阈值 (0.05-0.20)
     detect_burst: bool = True        # V4.0: 连拍检测开关（默认开启）
+    decode_device: str = 'cpu'       # JPEG 解码设备: 'cpu' | 'cuda'（nvJPEG，失败自动回退 CPU）
 
 
 @dataclass
@@ -58,6 +78,17 @@ class ProcessingCallbacks:
     progress: Optional[Callable[[int], None]] = None
 
 
+@dataclass(slots=True)
+class FileEntry:
+    """同一前缀的 RAW/JPEG 路径（扫描时一次性计算，下游直接复用，避免重复 join/stat）"""
+    prefix: str
+    raw_ext: Optional[str] = None
+    raw_path: Optional[str] = None
+    jpg_ext: Optional[str] = None
+    jpg_path: Optional[str] = None
+    raw_exists: bool = False  # 扫描时 DirEntry.is_file() 的结果
+
+
 @dataclass
 class ProcessingResult:
     """处理结果数据"""
@@ -111,7 +142,8 @@ class PhotoProcessor:
         self._log(f"  🦅 飞鸟检测: {'开启' if settings.detect_flight else '关闭'}")
         self._log(f"  📸 曝光检测: {'开启' if settings.detect_exposure else '关闭'}")
         self._log(f"  ⚙️  高级配置 - 最低锐度: {self.config.min_sharpness}")
-        self._log(f"  ⚙️  高级配置 - 最低美学: {self.config.min_nima}\n")
+        self._log(f"  ⚙️  高级配置 - 最低美学: {self.config.min_nima}")
+        self._log(f"  ⚙️  高级配置 - 推理精度: {resolve_yolo_precision(self.config.yolo_precision)}\n")
         
         # 统计数据（支持 0/1/2/3 星）
         self.stats = {
@@ -132,8 +164,11 @@ class PhotoProcessor:
         
         # 内部状态
         self.file_ratings = {}
+        self.file_entries: Dict[str, FileEntry] = {}  # 前缀 -> FileEntry（_scan_files 填充）
+        self._temp_jpg_paths: List[str] = []  # 处理结束后要清理的 JPG（RAW 转换生成 + 与 RAW 同名的 JPG）
         self.star2_reasons = {}  # 记录2星原因: 'sharpness' 或 'nima'
-        self.star_3_photos = []
+        self.photo_batch = PhotoBatch.allocate(0)  # 逐张评分数据（SoA），_process_images 中按总数预分配
+        self.pending_exif: Dict[str, Dict] = {}  # 待写入的 EXIF（按文件路径 upsert，处理结束后统一写入）
     
     def _log(self, msg: str, level: str = "info"):
         """内部日志方法"""
@@ -175,15 +210,21 @@ class PhotoProcessor:
         self._process_images(files_tbr, raw_dict)
         
         # 阶段4: 精选旗标计算
-        self._calculate_picked_flags()
+        picked_files = self._calculate_picked_flags()
+        
+        # 单次遍历 PhotoBatch，合并出最终 EXIF（评分 + 精选旗标）与移动列表
+        picked_items, other_items, files_to_move = self._collect_outputs(picked_files, organize_files)
+        
+        # 阶段4.5: EXIF 批量写入
+        self._write_pending_exif(picked_items, other_items)
         
         # 阶段5: 文件组织
         if organize_files:
-            self._move_files_to_rating_folders(raw_dict)
+            self._move_files_to_rating_folders(files_to_move)
         
         # 阶段6: 清理临时文件
         if cleanup_temp:
-            self._cleanup_temp_files(files_tbr, raw_dict)
+            self._cleanup_temp_files()
         
         # 记录结束时间
         end_time = time.time()
@@ -197,7 +238,7 @@ class PhotoProcessor:
         return ProcessingResult(
             stats=self.stats.copy(),
             file_ratings=self.file_ratings.copy(),
-            star_3_photos=self.star_3_photos.copy(),
+            star_3_photos=self.photo_batch.star_3_dicts(),
             total_time=self.stats['total_time'],
             avg_time=self.stats['avg_time']
         )
@@ -209,18 +250,40 @@ class PhotoProcessor:
         raw_dict = {}
         jpg_dict = {}
         files_tbr = []
+        file_entries = self.file_entries = {}
         
-        for filename in os.listdir(self.dir_path):
-            if filename.startswith('.'):
-                continue
-
-            
-            file_prefix, file_ext = os.path.splitext(filename)
-            if file_ext.lower() in RAW_EXTENSIONS:
-                raw_dict[file_prefix] = file_ext
-            if file_ext.lower() in JPG_EXTENSIONS:
-                jpg_dict[file_prefix] = file_ext
-                files_tbr.append(filename)
+        with os.scandir(self.dir_path) as entries:
+            for entry in entries:
+                filename = entry.name
+                if filename.startswith('.'):
+                    continue
+                
+                dot = filename.rfind('.')
+                if dot <= 0:
+                    continue
+                file_ext = filename[dot:]
+                ext_lower = file_ext.lower()
+                is_raw = ext_lower in RAW_EXTENSION_SET
+                if not (is_raw or ext_lower in JPG_EXTENSION_SET):
+                    continue
+                # DirEntry 自带文件类型信息，通常无需额外 stat
+                if not entry.is_file():
+                    continue
+                
+                prefix = filename[:dot]
+                file_entry = file_entries.get(prefix)
+                if file_entry is None:
+                    file_entry = file_entries[prefix] = FileEntry(prefix)
+                if is_raw:
+                    raw_dict[prefix] = file_ext
+                    file_entry.raw_ext = file_ext
+                    file_entry.raw_path = entry.path
+                    file_entry.raw_exists = True
+                else:
+                    jpg_dict[prefix] = file_ext
+                    file_entry.jpg_ext = file_ext
+                    file_entry.jpg_path = entry.path
+                    files_tbr.append(filename)
         
         scan_time = (time.time() - scan_start) * 1000
         self._log(f"⏱️  文件扫描耗时: {scan_time:.1f}ms")
@@ -231,43 +294,45 @@ class PhotoProcessor:
         """识别需要转换的RAW文件"""
         raw_files_to_convert = []
         
+        self._temp_jpg_paths = []
         for key, value in raw_dict.items():
             if key in jpg_dict:
                 jpg_dict.pop(key)
+                # 与 RAW 同名的 JPG 只用于 AI 检测，结束后同样作为临时文件清理
+                self._temp_jpg_paths.append(self.file_entries[key].jpg_path)
                 continue
             else:
-                raw_file_path = os.path.join(self.dir_path, key + value)
-                raw_files_to_convert.append((key, raw_file_path))
+                raw_files_to_convert.append((key, self.file_entries[key].raw_path))
         
         return raw_files_to_convert
     
     def _convert_raws(self, raw_files_to_convert, files_tbr):
         """并行转换RAW文件"""
         raw_start = time.time()
-        import multiprocessing
-        max_workers = min(4, multiprocessing.cpu_count())
+        # 进程池：rawpy/编码中的 Python 部分持有 GIL，多进程才能并行；进程数封顶 RAW_CONVERT_MAX_WORKERS
+        max_workers = max(1, min(os.cpu_count() or 1, RAW_CONVERT_MAX_WORKERS, len(raw_files_to_convert)))
         
-        self._log(f"🔄 开始并行转换 {len(raw_files_to_convert)} 个RAW文件({max_workers}线程)...")
+        self._log(f"🔄 开始并行转换 {len(raw_files_to_convert)} 个RAW文件({max_workers}进程)...")
         
-        def convert_single(args):
-            key, raw_path = args
-            try:
-                raw_to_jpeg(raw_path)
-                return (key, True, None)
-            except Exception as e:
-                return (key, False, str(e))
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
             future_to_raw = {
-                executor.submit(convert_single, args): args 
+                executor.submit(convert_raw_task, args): args 
                 for args in raw_files_to_convert
             }
             converted_count = 0
             
             for future in as_completed(future_to_raw):
-                key, success, error = future.result()
+                try:
+                    key, success, error = future.result()
+                except BrokenProcessPool as e:
+                    # 子进程异常退出（如被系统杀掉），记为该文件转换失败
+                    key, success, error = future_to_raw[future][0], False, str(e)
                 if success:
                     files_tbr.append(key + ".jpg")
+                    file_entry = self.file_entries[key]
+                    file_entry.jpg_ext = ".jpg"
+                    file_entry.jpg_path = os.path.join(self.dir_path, key + ".jpg")
+                    self._temp_jpg_paths.append(file_entry.jpg_path)
                     converted_count += 1
                     if converted_count % 5 == 0 or converted_count == len(raw_files_to_convert):
                         self._log(f"  ✅ 已转换 {converted_count}/{len(raw_files_to_convert)} 张")
@@ -287,7 +352,7 @@ class PhotoProcessor:
         # 加载模型
         model_start = time.time()
         self._log("🤖 加载AI模型...")
-        model = load_yolo_model()
+        model = load_yolo_model(precision=self.config.yolo_precision)
         model_time = (time.time() - model_start) * 1000
         self._log(f"⏱️  模型加载耗时: {model_time:.0f}ms")
         
@@ -319,25 +384,18 @@ class PhotoProcessor:
         total_files = len(files_tbr)
         self._log(f"📁 共 {total_files} 个文件待处理\n")
         
-        exiftool_mgr = get_exiftool_manager()
-        
-        # UI设置转为列表格式
-        ui_settings = [
-            self.settings.ai_confidence,
-            self.settings.sharpness_threshold,
-            self.settings.nima_threshold,
-            self.settings.save_crop,
-            self.settings.normalization_mode
-        ]
+        batch = self.photo_batch = PhotoBatch.allocate(total_files)
         
         ai_total_start = time.time()
         
-        for i, filename in enumerate(files_tbr, 1):
-            # 记录每张照片的开始时间
-            photo_start_time = time.time()
+        for i, filename, result, detect_time in self._iter_detections(files_tbr, model):
+            # 记录每张照片的开始时间（计入该照片分摊的批量检测耗时）
+            photo_start_time = time.time() - detect_time
             
             filepath = os.path.join(self.dir_path, filename)
             file_prefix, _ = os.path.splitext(filename)
+            file_entry = self.file_entries.get(file_prefix)
+            has_raw = file_entry is not None and file_entry.raw_exists
             
             # 更新进度
             should_update = (i % 5 == 0 or i == total_files or i == 1)
@@ -346,16 +404,12 @@ class PhotoProcessor:
                 self._progress(progress)
             
             # 优化流程：YOLO → 关键点检测(在crop上) → 条件NIMA
-            # Phase 1: 先做YOLO检测（跳过NIMA），获取鸟的位置和bbox
-            try:
-                result = detect_and_draw_birds(
-                    filepath, model, None, self.dir_path, ui_settings, None, skip_nima=True
-                )
-                if result is None:
-                    self._log(f"  ⚠️  无法处理(AI推理失败)", "error")
-                    continue
-            except Exception as e:
-                self._log(f"  ❌ 处理异常: {e}", "error")
+            # Phase 1: YOLO检测结果（由 _iter_detections 批量推理），获取鸟的位置和bbox
+            if isinstance(result, Exception):
+                self._log(f"  ❌ 处理异常: {result}", "error")
+                continue
+            if result is None:
+                self._log(f"  ⚠️  无法处理(AI推理失败)", "error")
                 continue
             
             # 解构 AI 结果 (包含bbox, 图像尺寸, 分割掩码) - V3.2移除BRISQUE
@@ -380,23 +434,23 @@ class PhotoProcessor:
                 
                 # 记录评分（用于文件移动）
                 self.file_ratings[file_prefix] = rating_value
+                batch.files[i - 1] = file_entry.raw_path if has_raw else filepath
+                batch.rating[i - 1] = rating_value
+                batch.confidence[i - 1] = confidence
                 
-                # 写入简化 EXIF
-                if file_prefix in raw_dict:
-                    raw_extension = raw_dict[file_prefix]
-                    target_file_path = os.path.join(self.dir_path, file_prefix + raw_extension)
-                    if os.path.exists(target_file_path):
-                        single_batch = [{
-                            'file': target_file_path,
-                            'rating': 0 if rating_value >= 0 else 0,  # -1星也写0
-                            'pick': -1 if rating_value == -1 else 0,
-                            'sharpness': None,
-                            'nima_score': None,
-                            'label': None,
-                            'focus_status': None,
-                            'caption': f"{rating_value}星 | {reason}",
-                        }]
-                        exiftool_mgr.batch_set_metadata(single_batch)
+                # 记录简化 EXIF（处理结束后批量写入）
+                if has_raw:
+                    target_file_path = file_entry.raw_path
+                    self.pending_exif[target_file_path] = {
+                        'file': target_file_path,
+                        'rating': 0 if rating_value >= 0 else 0,  # -1星也写0
+                        'pick': -1 if rating_value == -1 else 0,
+                        'sharpness': None,
+                        'nima_score': None,
+                        'label': None,
+                        'focus_status': None,
+                        'caption': f"{rating_value}星 | {reason}",
+                    }
                 
                 continue  # 跳过后续所有检测
             
@@ -601,9 +655,9 @@ class PhotoProcessor:
             # V3.9.3: 对焦点坐标获取（始终执行，用于调试图显示）
             # 即使是 0 星照片，也需要在调试图中显示对焦点位置
             if detected and bird_bbox is not None and img_dims is not None:
-                if file_prefix in raw_dict:
-                    raw_ext = raw_dict[file_prefix]
-                    raw_path = os.path.join(self.dir_path, file_prefix + raw_ext)
+                if has_raw:
+                    raw_ext = file_entry.raw_ext
+                    raw_path = file_entry.raw_path
                     # Nikon, Sony, Canon, Olympus, Fujifilm, Panasonic 全支持
                     if raw_ext.lower() in ['.nef', '.nrw', '.arw', '.cr3', '.cr2', '.orf', '.raf', '.rw2']:
                         try:
@@ -648,9 +702,9 @@ class PhotoProcessor:
                         head_center=head_center_orig,
                         head_radius=head_radius_val,
                     )
-                elif file_prefix in raw_dict:
+                elif has_raw:
                     # V3.9.3: 支持对焦检测的 RAW 文件但无法获取对焦点数据
-                    raw_ext = raw_dict[file_prefix]
+                    raw_ext = file_entry.raw_ext
                     if raw_ext.lower() in ['.nef', '.nrw', '.arw', '.cr3', '.cr2', '.orf', '.raf', '.rw2']:
                         # 检查是否是手动对焦模式
                         is_manual_focus = False
@@ -658,7 +712,7 @@ class PhotoProcessor:
                             import subprocess
                             focus_detector = get_focus_detector()
                             exiftool_path = focus_detector._get_exiftool_path()
-                            raw_path = os.path.join(self.dir_path, file_prefix + raw_ext)
+                            raw_path = file_entry.raw_path
                             # V3.9.4: 在 Windows 上隐藏控制台窗口
                             creationflags = subprocess.CREATE_NO_WINDOW if sys.platform.startswith('win') else 0
                             result = subprocess.run(
@@ -780,14 +834,16 @@ class PhotoProcessor:
             target_file_path = None
             target_extension = None
             
-            if file_prefix in raw_dict:
+            target_exists = False
+            
+            if has_raw:
                 # 有对应的 RAW 文件
-                raw_extension = raw_dict[file_prefix]
-                target_file_path = os.path.join(self.dir_path, file_prefix + raw_extension)
-                target_extension = raw_extension
+                target_file_path = file_entry.raw_path
+                target_extension = file_entry.raw_ext
+                target_exists = file_entry.raw_exists
                 
                 # 写入 EXIF（仅限 RAW 文件）
-                if os.path.exists(target_file_path):
+                if target_exists:
                     # V4.0: 标签逻辑 - 飞鸟绿色优先，头部对焦红色
                     label = None
                     if is_flying:
@@ -829,7 +885,8 @@ class PhotoProcessor:
                     
                     caption = "\n".join(caption_lines)
                     
-                    single_batch = [{
+                    # 记录 EXIF（处理结束后批量写入）
+                    self.pending_exif[target_file_path] = {
                         'file': target_file_path,
                         'rating': rating_value if rating_value >= 0 else 0,
                         'pick': pick,
@@ -838,15 +895,15 @@ class PhotoProcessor:
                         'label': label,
                         'focus_status': focus_status,  # V3.9: 对焦状态写入 Country 字段
                         'caption': caption,  # V4.0: 详细评分说明
-                    }]
-                    exiftool_mgr.batch_set_metadata(single_batch)
+                    }
             else:
                 # V3.4: 纯 JPEG 文件（没有对应 RAW）
                 target_file_path = filepath  # 使用当前处理的 JPEG 路径
                 target_extension = os.path.splitext(filename)[1]
+                target_exists = True  # 刚刚完成解码，文件必然存在
             
             # V3.4: 以下操作对 RAW 和纯 JPEG 都执行
-            if target_file_path and os.path.exists(target_file_path):
+            if target_file_path and target_exists:
                 # V4.1: 计算调整后锐度（用于 CSV，保证重新评星一致性）
                 adj_sharpness_csv = head_sharpness * focus_sharpness_weight if head_sharpness else 0
                 if is_flying and head_sharpness:
@@ -875,13 +932,14 @@ class PhotoProcessor:
                     adj_topiq_csv,  # V4.1: 调整后美学
                 )
                 
-                # 收集3星照片（V4.1: 使用调整后的值）
-                if rating_value == 3 and adj_topiq_csv is not None:
-                    self.star_3_photos.append({
-                        'file': target_file_path,
-                        'nima': adj_topiq_csv,  # V4.1: 调整后美学
-                        'sharpness': adj_sharpness_csv  # V4.1: 调整后锐度
-                    })
+                # 记录评分数据（V4.1: 使用调整后的值，3星且有美学分数的即精选候选）
+                idx = i - 1
+                batch.files[idx] = target_file_path
+                batch.rating[idx] = rating_value
+                batch.confidence[idx] = confidence
+                batch.sharpness[idx] = adj_sharpness_csv  # V4.1: 调整后锐度
+                if adj_topiq_csv is not None:
+                    batch.nima[idx] = adj_topiq_csv  # V4.1: 调整后美学
                 
                 # 记录评分（用于文件移动）
                 self.file_ratings[file_prefix] = rating_value
@@ -901,6 +959,89 @@ class PhotoProcessor:
         avg_ai_time = ai_total_time / total_files if total_files > 0 else 0
         self._log(f"\n⏱️  AI检测总耗时: {ai_total_time:.1f}秒 (平均 {avg_ai_time:.1f}秒/张)")
     
+    def _iter_detections(self, files_tbr, model):
+        """
+        流水线化 YOLO 检测：线程池预取解码 + 批量推理
+        
+        解码在后台线程中提前进行（窗口为 2 倍批量大小），推理每次处理一批，
+        主线程处理当前批次时后续图片仍在解码。
+        
+        Yields:
+            (序号, 文件名, 检测结果, 分摊的检测耗时秒数)
+            检测结果为 8 元组；无法处理时为 None；异常时为 Exception 实例
+        """
+        batch_size = max(1, app_config.ai.YOLO_BATCH_SIZE)
+        # INT8 静态图一次只能推理一张：解码仍按批预取，推理在 run_yolo_batch 中分段
+        max_batch = yolo_batch_limit(resolve_yolo_precision(self.config.yolo_precision))
+        prefetch = batch_size * 2
+        max_workers = max(1, min(prefetch, os.cpu_count() or 1))
+        
+        file_iter = enumerate(files_tbr, 1)
+        pending = deque()
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            def top_up():
+                while len(pending) < prefetch:
+                    item = next(file_iter, None)
+                    if item is None:
+                        return
+                    i, filename = item
+                    filepath = os.path.join(self.dir_path, filename)
+                    pending.append((i, filename, filepath, executor.submit(decode_image, filepath, self.dir_path, self.settings.decode_device)))
+            
+            top_up()
+            while pending:
+                batch_start = time.time()
+                
+                # 取出一批已提交的解码任务，并立即补充预取窗口
+                batch = [pending.popleft() for _ in range(min(batch_size, len(pending)))]
+                top_up()
+                
+                decoded = []
+                for i, filename, filepath, future in batch:
+                    try:
+                        decoded.append((i, filename, filepath, future.result()))
+                    except Exception as e:
+                        decoded.append((i, filename, filepath, e))
+                
+                valid = [item for item in decoded if isinstance(item[3], np.ndarray)]
+                results_by_index = {}
+                if valid:
+                    try:
+                        results = run_yolo_batch(model, [item[3] for item in valid], self.dir_path, max_batch)
+                        if results is None:
+                            # MPS 和 CPU 推理都失败，按"无鸟"记录
+                            for i, filename, filepath, image in valid:
+                                results_by_index[i] = record_no_bird(filepath, self.dir_path)
+                        else:
+                            for item, raw_result in zip(valid, results):
+                                results_by_index[item[0]] = raw_result
+                    except Exception as e:
+                        for item in valid:
+                            results_by_index[item[0]] = e
+                
+                per_photo_time = (time.time() - batch_start) / len(batch)
+                
+                for i, filename, filepath, image in decoded:
+                    if isinstance(image, Exception):
+                        yield i, filename, image, per_photo_time
+                        continue
+                    if image is None:
+                        yield i, filename, None, per_photo_time
+                        continue
+                    
+                    raw_result = results_by_index.get(i)
+                    if isinstance(raw_result, (tuple, Exception)):
+                        yield i, filename, raw_result, per_photo_time
+                        continue
+                    
+                    parse_start = time.time()
+                    try:
+                        result = parse_yolo_result(filepath, image, raw_result, self.dir_path)
+                    except Exception as e:
+                        result = e
+                    yield i, filename, result, per_photo_time + (time.time() - parse_start)
+    
     # 注意: _calculate_rating 方法已移至 core/rating_engine.py
     # 现在使用 self.rating_engine.calculate() 替代
     
@@ -1136,30 +1277,32 @@ class PhotoProcessor:
         except Exception as e:
             self._log(f"  ⚠️  更新CSV失败: {e}", "warning")
     
-    def _calculate_picked_flags(self):
-        """计算精选旗标 - 3星照片中美学+锐度双排名交集"""
-        if len(self.star_3_photos) == 0:
-            self._log("\nℹ️  无3星照片，跳过精选旗标计算")
-            return
+    def _calculate_picked_flags(self) -> set:
+        """
+        计算精选旗标 - 3星照片中美学+锐度双排名交集
         
-        self._log(f"\n🎯 计算精选旗标 (共{len(self.star_3_photos)}张3星照片)...")
-        top_percent = self.config.picked_top_percentage / 100.0
-        top_count = max(1, int(len(self.star_3_photos) * top_percent))
+        精选旗标由 _collect_outputs 合并进最终 EXIF，由 _write_pending_exif 统一写入
         
-        # 美学排序
-        sorted_by_nima = sorted(self.star_3_photos, key=lambda x: x['nima'], reverse=True)
-        nima_top_files = set([photo['file'] for photo in sorted_by_nima[:top_count]])
+        Returns:
+            精选文件路径集合
+        """
+        batch = self.photo_batch
+        star_3_idx = batch.star_3_indices()
+        if len(star_3_idx) == 0:
+            self._log("\nℹ️  无3星照片，跳过精选旗标计算")
+            return set()
         
-        # 锐度排序
-        sorted_by_sharpness = sorted(self.star_3_photos, key=lambda x: x['sharpness'], reverse=True)
-        sharpness_top_files = set([photo['file'] for photo in sorted_by_sharpness[:top_count]])
+        self._log(f"\n🎯 计算精选旗标 (共{len(star_3_idx)}张3星照片)...")
+        top_percent = self.config.picked_top_percentage / 100.0
+        top_count = max(1, int(len(star_3_idx) * top_percent))
         
-        # 交集
-        picked_files = nima_top_files & sharpness_top_files
+        # 美学 Top-K 与锐度 Top-K 的交集（O(N) 选取，并列按处理顺序取，与稳定排序一致）
+        picked_idx = batch.picked_indices(top_count)
+        picked_files = {batch.files[i] for i in picked_idx.tolist()}
         
         if len(picked_files) > 0:
-            self._log(f"  📌 美学Top{self.config.picked_top_percentage}%: {len(nima_top_files)}张")
-            self._log(f"  📌 锐度Top{self.config.picked_top_percentage}%: {len(sharpness_top_files)}张")
+            self._log(f"  📌 美学Top{self.config.picked_top_percentage}%: {top_count}张")
+            self._log(f"  📌 锐度Top{self.config.picked_top_percentage}%: {top_count}张")
             self._log(f"  ⭐ 双排名交集: {len(picked_files)}张 → 设为精选")
             
             # 调试：显示精选文件路径
@@ -1167,57 +1310,92 @@ class PhotoProcessor:
                 exists = os.path.exists(file_path)
                 self._log(f"    🔍 精选: {os.path.basename(file_path)} (存在: {exists})")
             
-            # 批量写入
-            picked_batch = [{
-                'file': file_path,
-                'rating': 3,
-                'pick': 1
-            } for file_path in picked_files]
-            
-            exiftool_mgr = get_exiftool_manager()
-            picked_stats = exiftool_mgr.batch_set_metadata(picked_batch)
-            
-            if picked_stats['failed'] == 0:
-                self._log(f"  ✅ 精选旗标写入成功")
-            else:
-                self._log(f"  ⚠️  {picked_stats['failed']} 张精选旗标写入失败", "warning")
-            
-            self.stats['picked'] = len(picked_files) - picked_stats.get('failed', 0)
         else:
             self._log(f"  ℹ️  双排名交集为空，未设置精选旗标")
-            self.stats['picked'] = 0
+        
+        return picked_files
     
-    def _move_files_to_rating_folders(self, raw_dict):
-        """移动文件到分类文件夹（V3.4: 支持纯 JPEG）"""
-        # 筛选需要移动的文件（包括所有星级，确保原目录为空）
+    def _collect_outputs(self, picked_files: set, organize_files: bool) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """
+        单次遍历 PhotoBatch，同时生成最终 EXIF 条目与文件移动列表
+        
+        Returns:
+            (精选 EXIF 条目, 其余 EXIF 条目, 待移动文件列表)
+        """
+        batch = self.photo_batch
+        picked_items = []
+        other_items = []
         files_to_move = []
-        for prefix, rating in self.file_ratings.items():
-            if rating in [-1, 0, 1, 2, 3]:
-                # V3.4: 优先使用 RAW，没有则使用 JPEG
-                if prefix in raw_dict:
-                    # 有对应的 RAW 文件
-                    raw_ext = raw_dict[prefix]
-                    file_path = os.path.join(self.dir_path, prefix + raw_ext)
-                    if os.path.exists(file_path):
-                        folder = RATING_FOLDER_NAMES.get(rating, "0星_放弃")
-                        files_to_move.append({
-                            'filename': prefix + raw_ext,
-                            'rating': rating,
-                            'folder': folder
-                        })
+        
+        for i in np.flatnonzero(batch.rating != PhotoBatch.RATING_UNSET).tolist():
+            file_path = batch.files[i]
+            if file_path is None:
+                continue
+            rating = int(batch.rating[i])
+            
+            # EXIF: 精选在已有评分条目上补旗标，纯 JPEG 等无条目的新建
+            item = self.pending_exif.get(file_path)
+            if file_path in picked_files:
+                if item is None:
+                    item = {'file': file_path}
+                item['rating'] = 3
+                item['pick'] = 1
+                picked_items.append(item)
+            elif item is not None:
+                other_items.append(item)
+            
+            # 移动: 包括所有星级，确保原目录为空（V3.4: RAW 优先，纯 JPEG 移动 JPEG 本身）
+            if organize_files:
+                files_to_move.append({
+                    'filename': os.path.basename(file_path),
+                    'rating': rating,
+                    'folder': RATING_FOLDER_NAMES.get(rating, "0星_放弃")
+                })
+        
+        self.pending_exif.clear()
+        return picked_items, other_items, files_to_move
+    
+    def _write_pending_exif(self, picked_items: List[Dict], other_items: List[Dict]):
+        """批量写入 EXIF 元数据（精选文件单独成批，便于统计旗标写入结果）"""
+        self.stats['picked'] = 0
+        total_items = len(picked_items) + len(other_items)
+        if total_items == 0:
+            return
+        
+        exif_start = time.time()
+        self._log(f"\n📝 批量写入 EXIF ({total_items} 个文件)...")
+        
+        exiftool_mgr = get_exiftool_manager()
+        # 常驻 exiftool 进程：所有分批写入复用同一进程，无需每批重新启动
+        exiftool_mgr.start_session()
+        
+        def write_in_chunks(items):
+            failed = 0
+            for start in range(0, len(items), EXIF_BATCH_SIZE):
+                chunk_stats = exiftool_mgr.batch_set_metadata(items[start:start + EXIF_BATCH_SIZE])
+                failed += chunk_stats.get('failed', 0)
+            return failed
+        
+        try:
+            if picked_items:
+                picked_failed = write_in_chunks(picked_items)
+                if picked_failed == 0:
+                    self._log(f"  ✅ 精选旗标写入成功")
                 else:
-                    # V3.4: 纯 JPEG 文件
-                    for jpg_ext in ['.jpg', '.jpeg', '.JPG', '.JPEG']:
-                        jpg_path = os.path.join(self.dir_path, prefix + jpg_ext)
-                        if os.path.exists(jpg_path):
-                            folder = RATING_FOLDER_NAMES.get(rating, "0星_放弃")
-                            files_to_move.append({
-                                'filename': prefix + jpg_ext,
-                                'rating': rating,
-                                'folder': folder
-                            })
-                            break  # 找到就跳出
+                    self._log(f"  ⚠️  {picked_failed} 张精选旗标写入失败", "warning")
+                self.stats['picked'] = len(picked_items) - picked_failed
+            
+            other_failed = write_in_chunks(other_items)
+            if other_failed > 0:
+                self._log(f"  ⚠️  {other_failed} 个文件 EXIF 写入失败", "warning")
+        finally:
+            exiftool_mgr.close_session()
         
+        exif_time = time.time() - exif_start
+        self._log(f"⏱️  EXIF写入耗时: {exif_time:.1f}秒")
+    
+    def _move_files_to_rating_folders(self, files_to_move: List[Dict]):
+        """移动文件到分类文件夹（V3.4: 支持纯 JPEG；移动列表由 _collect_outputs 生成）"""
         if not files_to_move:
             self._log("\n📂 无需移动文件")
             return
@@ -1227,29 +1405,31 @@ class PhotoProcessor:
         # 创建文件夹（使用实际的目录名）
         folders_in_use = set(f['folder'] for f in files_to_move)
         for folder_name in folders_in_use:
-            folder_path = os.path.join(self.dir_path, folder_name)
-            if not os.path.exists(folder_path):
-                os.makedirs(folder_path)
+            # 直接创建，已存在由 FileExistsError 告知（省去预先 stat）
+            try:
+                os.mkdir(os.path.join(self.dir_path, folder_name))
                 self._log(f"  📁 创建文件夹: {folder_name}/")
+            except FileExistsError:
+                pass
         
-        # 移动文件
+        # 移动文件（批量移动，目标已存在则跳过）
+        tasks = [
+            (
+                os.path.join(self.dir_path, file_info['filename']),
+                os.path.join(self.dir_path, file_info['folder'], file_info['filename'])
+            )
+            for file_info in files_to_move
+        ]
         moved_count = 0
-        for file_info in files_to_move:
-            src_path = os.path.join(self.dir_path, file_info['filename'])
-            dst_folder = os.path.join(self.dir_path, file_info['folder'])
-            dst_path = os.path.join(dst_folder, file_info['filename'])
-            
-            try:
-                if os.path.exists(dst_path):
-                    continue
-                shutil.move(src_path, dst_path)
+        for file_info, (status, error) in zip(files_to_move, move_files(tasks)):
+            if status == MOVE_OK:
                 moved_count += 1
-            except Exception as e:
-                self._log(f"  ⚠️  移动失败: {file_info['filename']} - {e}", "warning")
+            elif status == MOVE_FAILED:
+                self._log(f"  ⚠️  移动失败: {file_info['filename']} - {error}", "warning")
         
-        # 生成manifest
+        # 生成manifest（每个文件保留 folder：旧版本恢复时直接读取 entry['folder']）
         manifest = {
-            "version": "1.0",
+            "version": "1.1",
             "created": datetime.now().isoformat(),
             "app_version": "Refactored-Core",
             "original_dir": self.dir_path,
@@ -1260,27 +1440,28 @@ class PhotoProcessor:
         
         manifest_path = os.path.join(self.dir_path, ".superpicky_manifest.json")
         try:
-            with open(manifest_path, 'w', encoding='utf-8') as f:
-                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                with open(manifest_path, 'wb') as f:
+                    f.write(orjson.dumps(manifest, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(manifest_path, 'w', encoding='utf-8') as f:
+                    json.dump(manifest, f, ensure_ascii=False, indent=2)
             self._log(f"  ✅ 已移动 {moved_count} 张照片")
             self._log(f"  📋 Manifest: .superpicky_manifest.json")
         except Exception as e:
             self._log(f"  ⚠️  保存manifest失败: {e}", "warning")
     
-    def _cleanup_temp_files(self, files_tbr, raw_dict):
-        """清理临时JPG文件"""
+    def _cleanup_temp_files(self):
+        """清理临时JPG文件（列表在识别/转换 RAW 时已记录，无需重新推导）"""
         self._log("\n🧹 清理临时文件...")
+        
         deleted_count = 0
-        for filename in files_tbr:
-            file_prefix, file_ext = os.path.splitext(filename)
-            if file_prefix in raw_dict and file_ext.lower() in ['.jpg', '.jpeg']:
-                jpg_path = os.path.join(self.dir_path, filename)
-                try:
-                    if os.path.exists(jpg_path):
-                        os.remove(jpg_path)
-                        deleted_count += 1
-                except Exception as e:
-                    self._log(f"  ⚠️  删除失败 {filename}: {e}", "warning")
+        paths = self._temp_jpg_paths
+        for path, (status, error) in zip(paths, remove_files(paths)):
+            if status == REMOVE_OK:
+                deleted_count += 1
+            elif status == REMOVE_FAILED:
+                self._log(f"  ⚠️  删除失败 {os.path.basename(path)}: {error}", "warning")
         
         if deleted_count > 0:
             self._log(f"  ✅ 已删除 {deleted_count} 个临时JPG文件")
@@ -23,12 +23,82 @@ from dataclasses import dataclass
 from typing import Optional, Tuple
 
 
-@dataclass
+# 评分原因模板（按原因码索引，延迟格式化）
+REASON_NO_BIRD = 0
+REASON_LOW_CONFIDENCE = 1
+REASON_KEYPOINTS_HIDDEN = 2
+REASON_LOW_SHARPNESS = 3
+REASON_LOW_AESTHETICS = 4
+REASON_GRADED = 5
+
+_REASON_TEMPLATES = (
+    "未检测到鸟类",
+    "置信度低({0:.0%})",
+    "角度不佳（关键点不可见，但有鸟）",
+    "锐度太低({0:.0f}<{1})",
+    "美学太差({0:.1f}<{1:.1f})",
+)
+
+_RATING_NAMES = {3: '优选', 2: '良好', 1: '普通', 0: '问题'}
+
+
+def _format_graded_reason(
+    rating: int,
+    base_reason: str,
+    is_overexposed: bool,
+    is_underexposed: bool,
+    focus_sharpness_weight: float,
+    visibility_weight: float,
+    best_eye_visibility: float,
+    is_flying: bool,
+) -> str:
+    """构建通过最低标准后的评分原因"""
+    rating_name = _RATING_NAMES.get(rating, '普通')
+    
+    # V4.0: 曝光问题标记
+    exposure_suffix = ""
+    if is_overexposed and is_underexposed:
+        exposure_suffix = "，曝光异常"
+    elif is_overexposed:
+        exposure_suffix = "，过曝"
+    elif is_underexposed:
+        exposure_suffix = "，欠曝"
+    
+    # 设置对焦状态后缀（精焦/合焦/失焦/脱焦 - 全部显示）
+    if focus_sharpness_weight > 1.0:
+        focus_suffix = "，精焦"
+    elif focus_sharpness_weight >= 1.0:
+        focus_suffix = "，合焦"
+    elif focus_sharpness_weight >= 0.7:
+        focus_suffix = "，失焦"
+    else:  # 0.5
+        focus_suffix = "，脱焦"
+    
+    # 可见度降权说明
+    visibility_suffix = ""
+    if visibility_weight < 1.0:
+        visibility_suffix = f"，眼睛可见度{best_eye_visibility:.0%}"
+    
+    # 飞鸟标记
+    flying_suffix = "，飞鸟加成" if is_flying else ""
+    
+    return f"{rating_name}照片（{base_reason}{exposure_suffix}{focus_suffix}{visibility_suffix}{flying_suffix}）"
+
+
+@dataclass(slots=True)
 class RatingResult:
-    """评分结果"""
+    """评分结果（原因字符串在读取 reason 时才格式化）"""
     rating: int          # -1=无鸟, 0=普通(问题照片), 1=普通(合格), 2=良好, 3=优选
     pick: int            # 0=无旗标, 1=精选, -1=排除
-    reason: str          # 评分原因说明
+    reason_code: int     # 评分原因码（REASON_*）
+    reason_args: tuple = ()  # 原因格式化参数
+    
+    @property
+    def reason(self) -> str:
+        """评分原因说明"""
+        if self.reason_code == REASON_GRADED:
+            return _format_graded_reason(*self.reason_args)
+        return _REASON_TEMPLATES[self.reason_code].format(*self.reason_args)
     
     @property
     def star_display(self) -> str:
@@ -45,53 +115,20 @@ class RatingResult:
             return "❌"
 
 
-class RatingEngine:
+def _build_calculator(
+    min_confidence: float,
+    min_sharpness: float,
+    min_nima: float,
+    sharpness_threshold: float,
+    nima_threshold: float,
+):
     """
-    评分引擎（关键点增强版 V3.8）
-    
-    评分规则：
-    1. 无鸟 → -1 (Rejected)
-    2. 最低标准不通过 → 0 (普通-问题照片)
-    3. 所有关键点不可见（双眼+鸟喙都<0.3） → 0 (普通-角度不佳)
-    4. 眼睛可见度封顶：
-       - best_eye 0.3-0.5: 3星降为2星, 2星降为1星
-       - best_eye >= 0.5: 正常评分
-    5. 锐度 >= 阈值 AND TOPIQ >= 阈值 → 3星 (优选)
-    6. 锐度 >= 阈值 OR TOPIQ >= 阈值 → 2星 (良好)
-    7. 通过最低标准但都不达标 → 1星 (普通-合格)
+    按阈值生成特化的评分函数
+
+    阈值作为闭包常量绑定后，每张照片的评分调用不再需要读取 self.* 属性；
+    RatingEngine 的阈值属性被修改时会重新调用本函数
     """
-    
-    def __init__(
-        self,
-        # 最低标准阈值（低于此为 0 星）
-        min_confidence: float = 0.50,
-        min_sharpness: float = 100,    # 头部区域锐度最低阈值
-        min_nima: float = 3.5,         # V4.0: 降低美学最低阈值
-        # 2/3星达标阈值
-        sharpness_threshold: float = 400,  # 头部区域锐度达标阈值（2星和3星共用）
-        nima_threshold: float = 5.0,  # TOPIQ 美学达标阈值
-    ):
-        """
-        初始化评分引擎
-        
-        Args:
-            min_confidence: AI 置信度最低阈值 (0-1)
-            min_sharpness: 锐度最低阈值
-            min_nima: TOPIQ 美学最低阈值 (0-10)
-            sharpness_threshold: 锐度达标阈值（2星和3星共用）
-            topiq_threshold: TOPIQ 美学达标阈值 (2/3星)，范围 4.0-7.0
-        """
-        # 最低标准
-        self.min_confidence = min_confidence
-        self.min_sharpness = min_sharpness
-        self.min_nima = min_nima
-        
-        # 达标标准（2星和3星共用）
-        self.sharpness_threshold = sharpness_threshold
-        self.nima_threshold = nima_threshold
-    
     def calculate(
-        self,
         detected: bool,
         confidence: float,
         sharpness: float,
@@ -132,53 +169,23 @@ class RatingEngine:
         """
         # 第一步：无鸟检查
         if not detected:
-            return RatingResult(
-                rating=-1,
-                pick=-1,
-                reason="未检测到鸟类"
-            )
+            return RatingResult(-1, -1, REASON_NO_BIRD)
         
         # 第二步：置信度检查（低于 50% 给 0星）
-        if confidence < self.min_confidence:
-            return RatingResult(
-                rating=0,
-                pick=0,
-                reason=f"置信度低({confidence:.0%})"
-            )
+        if confidence < min_confidence:
+            return RatingResult(0, 0, REASON_LOW_CONFIDENCE, (confidence,))
         # 第三步：关键点可见性检查（V4.0: 先判定眼睛）
         # 如果看不到眼睛/嘴巴，直接给 1 星，不再判断美学
         if all_keypoints_hidden:
-            return RatingResult(
-                rating=1,
-                pick=0,
-                reason="角度不佳（关键点不可见，但有鸟）"
-            )
+            return RatingResult(1, 0, REASON_KEYPOINTS_HIDDEN)
         
         # 第四步：锐度检查
-        if sharpness < self.min_sharpness:
-            return RatingResult(
-                rating=0,
-                pick=0,
-                reason=f"锐度太低({sharpness:.0f}<{self.min_sharpness})"
-            )
+        if sharpness < min_sharpness:
+            return RatingResult(0, 0, REASON_LOW_SHARPNESS, (sharpness, min_sharpness))
         
         # 第五步：美学检查（放在眼睛和锐度之后）
-        if topiq is not None and topiq < self.min_nima:
-            return RatingResult(
-                rating=0,
-                pick=0,
-                reason=f"美学太差({topiq:.1f}<{self.min_nima:.1f})"
-            )
-        
-        # V4.0: 曝光问题标记
-        has_exposure_issue = is_overexposed or is_underexposed
-        exposure_suffix = ""
-        if is_overexposed and is_underexposed:
-            exposure_suffix = "，曝光异常"
-        elif is_overexposed:
-            exposure_suffix = "，过曝"
-        elif is_underexposed:
-            exposure_suffix = "，欠曝"
+        if topiq is not None and topiq < min_nima:
+            return RatingResult(0, 0, REASON_LOW_AESTHETICS, (topiq, min_nima))
         
         # V4.0: 对焦权重处理 - 先应用对焦权重
         # 锐度权重: 1.1(头部) / 1.0(SEG) / 0.7(BBox) / 0.5(外部)
@@ -192,20 +199,9 @@ class RatingEngine:
             if adjusted_topiq is not None:
                 adjusted_topiq = adjusted_topiq * 1.1
         
-        # 设置对焦状态后缀（精焦/合焦/失焦/脱焦 - 全部显示）
-        focus_suffix = ""
-        if focus_sharpness_weight > 1.0:
-            focus_suffix = "，精焦"
-        elif focus_sharpness_weight >= 1.0:
-            focus_suffix = "，合焦"
-        elif focus_sharpness_weight >= 0.7:
-            focus_suffix = "，失焦"
-        else:  # 0.5
-            focus_suffix = "，脱焦"
-        
         # 第五步：基础星级判定（锐度 >= 阈值 AND/OR TOPIQ >= 阈值）
-        sharpness_ok = adjusted_sharpness >= self.sharpness_threshold
-        topiq_ok = adjusted_topiq is not None and adjusted_topiq >= self.nima_threshold
+        sharpness_ok = adjusted_sharpness >= sharpness_threshold
+        topiq_ok = adjusted_topiq is not None and adjusted_topiq >= nima_threshold
         
         # 计算基础星级
         if sharpness_ok and topiq_ok:
@@ -228,25 +224,99 @@ class RatingEngine:
         rating = round(base_rating * visibility_weight)
         
         # 曝光问题降级
-        if has_exposure_issue:
+        if is_overexposed or is_underexposed:
             rating = max(0, rating - 1)
         
-        # 构建理由
-        rating_names = {3: '优选', 2: '良好', 1: '普通', 0: '问题'}
-        rating_name = rating_names.get(rating, '普通')
+        return RatingResult(rating, 0, REASON_GRADED, (
+            rating, base_reason, is_overexposed, is_underexposed,
+            focus_sharpness_weight, visibility_weight, best_eye_visibility, is_flying,
+        ))
+
+    return calculate
+
+
+def _threshold_property(name: str, doc: str) -> property:
+    """阈值属性：赋值后重新生成特化的 calculate，保证新阈值立即生效"""
+    attr = '_' + name
+
+    def fget(self):
+        return getattr(self, attr)
+
+    def fset(self, value):
+        setattr(self, attr, value)
+        # __init__ 中逐个赋值时阈值尚未齐全，由 __init__ 末尾统一特化
+        if getattr(self, '_ready', False):
+            self._specialize()
+
+    return property(fget, fset, doc=doc)
+
+
+class RatingEngine:
+    """
+    评分引擎（关键点增强版 V3.8）
+    
+    评分规则：
+    1. 无鸟 → -1 (Rejected)
+    2. 最低标准不通过 → 0 (普通-问题照片)
+    3. 所有关键点不可见（双眼+鸟喙都<0.3） → 0 (普通-角度不佳)
+    4. 眼睛可见度封顶：
+       - best_eye 0.3-0.5: 3星降为2星, 2星降为1星
+       - best_eye >= 0.5: 正常评分
+    5. 锐度 >= 阈值 AND TOPIQ >= 阈值 → 3星 (优选)
+    6. 锐度 >= 阈值 OR TOPIQ >= 阈值 → 2星 (良好)
+    7. 通过最低标准但都不达标 → 1星 (普通-合格)
+    
+    calculate 是按当前阈值生成的实例属性（见 _build_calculator），
+    修改任一阈值属性都会重新生成
+    """
+    
+    min_confidence = _threshold_property('min_confidence', "AI 置信度最低阈值 (0-1)")
+    min_sharpness = _threshold_property('min_sharpness', "锐度最低阈值")
+    min_nima = _threshold_property('min_nima', "TOPIQ 美学最低阈值 (0-10)")
+    sharpness_threshold = _threshold_property('sharpness_threshold', "锐度达标阈值（2星和3星共用）")
+    nima_threshold = _threshold_property('nima_threshold', "TOPIQ 美学达标阈值 (2/3星)")
+    
+    def __init__(
+        self,
+        # 最低标准阈值（低于此为 0 星）
+        min_confidence: float = 0.50,
+        min_sharpness: float = 100,    # 头部区域锐度最低阈值
+        min_nima: float = 3.5,         # V4.0: 降低美学最低阈值
+        # 2/3星达标阈值
+        sharpness_threshold: float = 400,  # 头部区域锐度达标阈值（2星和3星共用）
+        nima_threshold: float = 5.0,  # TOPIQ 美学达标阈值
+    ):
+        """
+        初始化评分引擎
         
-        # 可见度降权说明
-        visibility_suffix = ""
-        if visibility_weight < 1.0:
-            visibility_suffix = f"，眼睛可见度{best_eye_visibility:.0%}"
+        Args:
+            min_confidence: AI 置信度最低阈值 (0-1)
+            min_sharpness: 锐度最低阈值
+            min_nima: TOPIQ 美学最低阈值 (0-10)
+            sharpness_threshold: 锐度达标阈值（2星和3星共用）
+            topiq_threshold: TOPIQ 美学达标阈值 (2/3星)，范围 4.0-7.0
+        """
+        # 最低标准
+        self.min_confidence = min_confidence
+        self.min_sharpness = min_sharpness
+        self.min_nima = min_nima
         
-        # 飞鸟标记
-        flying_suffix = "，飞鸟加成" if is_flying else ""
+        # 达标标准（2星和3星共用）
+        self.sharpness_threshold = sharpness_threshold
+        self.nima_threshold = nima_threshold
         
-        return RatingResult(
-            rating=rating,
-            pick=0,
-            reason=f"{rating_name}照片（{base_reason}{exposure_suffix}{focus_suffix}{visibility_suffix}{flying_suffix}）"
+        # 阈值齐全后生成特化评分函数，此后每次修改阈值都会重新生成
+        self._ready = True
+        self._specialize()
+    
+    def _specialize(self):
+        """按当前阈值重新生成特化的 calculate（覆盖实例上的 calculate 属性）"""
+        self.calculate = _build_calculator(
+            self.min_confidence,
+            self.min_sharpness,
+            self.min_nima,
+            self.sharpness_threshold,
+            self.nima_threshold,
         )
     
     def update_thresholds(
@@ -254,11 +324,12 @@ class RatingEngine:
         sharpness_threshold: Optional[float] = None,
         nima_threshold: Optional[float] = None,
     ):
-        """更新达标阈值（用于 UI 滑块调整）"""
+        """更新达标阈值（用于 UI 滑块调整），两个阈值一起更新后只特化一次"""
         if sharpness_threshold is not None:
-            self.sharpness_threshold = sharpness_threshold
+            self._sharpness_threshold = sharpness_threshold
         if nima_threshold is not None:
-            self.nima_threshold = nima_threshold
+            self._nima_threshold = nima_threshold
+        self._specialize()
 
 
 def create_rating_engine_from_config(config) -> RatingEngine:
@@ -6,13 +6,48 @@ ExifTool管理器
 """
 
 import os
+import queue
+import re
 import subprocess
 import sys
+import threading
+import time
 from typing import Optional, List, Dict
 from pathlib import Path
 from constants import RATING_FOLDER_NAMES
 
 
+# 常驻进程中单条命令的超时（秒）：超时视为 exiftool 卡死（如损坏的 RAW），杀掉并重启进程
+SESSION_COMMAND_TIMEOUT = 60
+
+# 写入结果统计行，如 "    1 image files updated" / "    1 files weren't updated due to errors"
+_UPDATED_RE = re.compile(r"^\s*(\d+) image files? (?:updated|unchanged)\s*$", re.MULTILINE)
+_NOT_UPDATED_RE = re.compile(r"^\s*(\d+) files? weren't updated", re.MULTILINE)
+
+
+def _write_succeeded(output: str) -> bool:
+    """
+    按 exiftool 的统计行判断单文件写入是否成功
+
+    不能用 'Error' in output：文件名中的 "Error" 会误判，Warning 导致的失败又会漏判
+    没有统计行（如 "Nothing to do."）也视为失败
+    """
+    updated = sum(int(n) for n in _UPDATED_RE.findall(output))
+    not_updated = sum(int(n) for n in _NOT_UPDATED_RE.findall(output))
+    return updated > 0 and not_updated == 0
+
+
+def _pump_output(stream, lines: queue.Queue):
+    """后台读取常驻进程输出（按行放入队列，EOF 时放入 None），使读取可以带超时"""
+    try:
+        for line in iter(stream.readline, b''):
+            lines.put(line)
+    except (OSError, ValueError):
+        pass
+    finally:
+        lines.put(None)
+
+
 class ExifToolManager:
     """ExifTool管理器 - 使用本地打包的exiftool"""
 
@@ -21,6 +56,13 @@ class ExifToolManager:
         # 获取exiftool路径（支持PyInstaller打包）
         self.exiftool_path = self._get_exiftool_path()
 
+        # 常驻进程（-stay_open），由 start_session/close_session 管理
+        self._session: Optional[subprocess.Popen] = None
+        self._session_lines: Optional[queue.Queue] = None
+        self._session_seq = 0
+        # 常驻进程的管道由单例共享，多个调用方（处理线程、UI 恢复、CLI）需串行使用
+        self._session_lock = threading.Lock()
+
         # 验证exiftool可用性
         if not self._verify_exiftool():
             raise RuntimeError(f"ExifTool不可用: {self.exiftool_path}")
@@ -115,6 +157,131 @@ class ExifToolManager:
             print(f"   ❌ ExifTool 验证异常: {type(e).__name__}: {e}")
             return False
 
+    def start_session(self) -> bool:
+        """
+        启动常驻 exiftool 进程（-stay_open True -@ -）
+
+        会话期间 batch_set_metadata 通过管道复用同一进程，省去每批启动 exiftool 的开销
+        使用完毕必须调用 close_session()
+
+        Returns:
+            是否启动成功（失败时批量写入自动回退到单次调用）
+        """
+        with self._session_lock:
+            return self._start_session_locked()
+
+    def _start_session_locked(self) -> bool:
+        if self._session is not None and self._session.poll() is None:
+            return True
+
+        try:
+            # V3.9.4: 在 Windows 上隐藏控制台窗口
+            creationflags = subprocess.CREATE_NO_WINDOW if sys.platform.startswith('win') else 0
+            self._session = subprocess.Popen(
+                [self.exiftool_path, '-stay_open', 'True', '-@', '-'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,  # 错误信息与输出合并，按 {ready} 标记统一读取
+                creationflags=creationflags
+            )
+        except Exception as e:
+            print(f"⚠️  ExifTool 常驻进程启动失败，回退到单次调用: {e}")
+            self._session = None
+            return False
+
+        self._session_lines = queue.Queue()
+        threading.Thread(
+            target=_pump_output, args=(self._session.stdout, self._session_lines), daemon=True
+        ).start()
+        return True
+
+    def close_session(self):
+        """关闭常驻 exiftool 进程"""
+        with self._session_lock:
+            self._close_session_locked()
+
+    def _close_session_locked(self, kill: bool = False):
+        proc = self._session
+        self._session = None
+        self._session_lines = None
+        if proc is None:
+            return
+
+        try:
+            if kill:
+                proc.kill()
+                proc.wait(timeout=10)
+            elif proc.poll() is None:
+                proc.stdin.write(b'-stay_open\nFalse\n')
+                proc.stdin.flush()
+                proc.wait(timeout=10)
+        except Exception:
+            proc.kill()
+        finally:
+            for stream in (proc.stdin, proc.stdout):
+                try:
+                    stream.close()
+                except Exception:
+                    pass
+
+    def _session_execute(self, args: List[str], timeout: Optional[float] = None) -> Optional[str]:
+        """
+        在常驻进程中执行一条命令（参数每行一个，以 -executeN 结束）
+
+        Args:
+            timeout: 等待 {readyN} 的最长秒数（默认 SESSION_COMMAND_TIMEOUT）
+
+        Returns:
+            exiftool 输出文本；进程不可用或通信失败时返回 None
+
+        Raises:
+            TimeoutError: 命令超时（已杀掉卡死的进程并重启会话，后续命令可继续使用）
+        """
+        if timeout is None:
+            timeout = SESSION_COMMAND_TIMEOUT
+
+        with self._session_lock:
+            proc = self._session
+            if proc is None or proc.poll() is not None:
+                return None
+
+            self._session_seq += 1
+            ready_marker = f'{{ready{self._session_seq}}}'.encode()
+            payload = '\n'.join(args) + f'\n-execute{self._session_seq}\n'
+            lines = self._session_lines
+
+            try:
+                proc.stdin.write(payload.encode('utf-8'))
+                proc.stdin.flush()
+
+                output = []
+                deadline = time.monotonic() + timeout
+                while True:
+                    line = lines.get(timeout=max(0.0, deadline - time.monotonic()))
+                    if line is None:
+                        raise EOFError("exiftool 进程意外退出")
+                    if line.rstrip() == ready_marker:
+                        break
+                    output.append(line)
+            except queue.Empty:
+                print(f"⚠️  ExifTool 命令超过 {timeout}s 未完成，重启常驻进程")
+                self._close_session_locked(kill=True)
+                self._start_session_locked()
+                raise TimeoutError(f"exiftool 命令超时 ({timeout}s)")
+            except Exception as e:
+                print(f"⚠️  ExifTool 常驻进程通信失败: {e}")
+                self._close_session_locked(kill=True)
+                return None
+
+            return b''.join(output).decode('utf-8', errors='replace')
+
+    @staticmethod
+    def _escape_arg_value(tag_arg: str) -> str:
+        """
+        参数文件按行分隔参数，换行需转义为 HTML 实体（配合 -E 写入时还原）
+        """
+        return tag_arg.replace('&', '&amp;').replace('\n', '&#10;')
+
     def set_rating_and_pick(
         self,
         file_path: str,
@@ -217,10 +384,8 @@ class ExifToolManager:
         """
         stats = {'success': 0, 'failed': 0}
 
-        # ExifTool批量模式：使用 -execute 分隔符为每个文件单独设置参数
-        # V3.9.1: 改用 XMP 字段，XMP 原生支持 UTF-8 中文
-        # V3.9.4: 强制指定编码为 utf8 解决 Windows/Mac 的中文乱码问题
-        cmd = [self.exiftool_path, '-charset', 'utf8']
+        # 每个文件的 (标签参数, 文件路径)
+        file_commands = []
 
         for item in files_metadata:
             file_path = item['file']
@@ -239,11 +404,12 @@ class ExifToolManager:
                 continue
 
             # 为这个文件添加命令参数
+            tags = []
             # V4.1: 只在明确提供时才写入 Rating/Pick
             if rating is not None:
-                cmd.append(f'-Rating={rating}')
+                tags.append(f'-Rating={rating}')
             if pick is not None:
-                cmd.append(f'-XMP:Pick={pick}')
+                tags.append(f'-XMP:Pick={pick}')
 
             # V3.9.1: 改用 XMP 字段代替 IPTC，解决 Canon CR3 等格式不支持 IPTC 问题
             # XMP 字段在 Lightroom 中同样可以按 City/State/Country 排序
@@ -252,26 +418,72 @@ class ExifToolManager:
             # 格式：000.00 到 999.99，例如：004.68, 100.50
             if sharpness is not None:
                 sharpness_str = f'{sharpness:06.2f}'  # 6位总宽度，2位小数，前面补零
-                cmd.append(f'-XMP:City={sharpness_str}')
+                tags.append(f'-XMP:City={sharpness_str}')
 
             # NIMA/TOPIQ美学评分 → XMP:State（省/州）
             if nima_score is not None:
                 nima_str = f'{nima_score:05.2f}'
-                cmd.append(f'-XMP:State={nima_str}')
+                tags.append(f'-XMP:State={nima_str}')
 
             # V3.4: 颜色标签（如 'Green' 用于飞鸟）
             if label is not None:
-                cmd.append(f'-XMP:Label={label}')
+                tags.append(f'-XMP:Label={label}')
             
             # V3.9: 对焦状态 → XMP:Country（国家）
             if focus_status is not None:
-                cmd.append(f'-XMP:Country={focus_status}')
+                tags.append(f'-XMP:Country={focus_status}')
             
             # V4.0: 详细评分说明 → XMP:Description（题注）
             if caption is not None:
                 # V4.2: 恢复换行符支持，并在 Windows 下通过 -charset utf8 保证正确写入
-                cmd.append(f'-XMP:Description={caption}')
+                tags.append(f'-XMP:Description={caption}')
+
+            file_commands.append((tags, file_path))
 
+        # V3.1.2: 只在处理多个文件时显示消息（单文件处理不显示，避免刷屏）
+        if len(files_metadata) > 1:
+            print(f"📦 批量处理 {len(files_metadata)} 个文件...")
+
+        # 常驻进程可用时，逐文件通过管道执行（无需每批启动 exiftool）
+        # 会话是否可用由 _session_execute 在锁内判断：不可用时返回 None，全部回退到单次调用
+        written = []  # 写入成功的文件（只为这些文件创建侧车）
+        remaining = []
+        for index, (tags, file_path) in enumerate(file_commands):
+            try:
+                output = self._session_execute(
+                    ['-charset', 'utf8', '-charset', 'filename=utf8', '-E']
+                    + [self._escape_arg_value(tag) for tag in tags]
+                    + [file_path, '-overwrite_original']
+                )
+            except TimeoutError:
+                # 卡死的文件记为失败，会话已重启，继续处理后续文件
+                print(f"❌ 写入超时 {os.path.basename(file_path)}")
+                stats['failed'] += 1
+                continue
+            if output is None:
+                # 会话不可用或中断：剩余文件回退到单次调用
+                remaining = file_commands[index:]
+                break
+            if not _write_succeeded(output):
+                print(f"❌ 写入失败 {os.path.basename(file_path)}: {output.strip()}")
+                stats['failed'] += 1
+            else:
+                stats['success'] += 1
+                written.append(file_path)
+
+        if not remaining:
+            if len(files_metadata) > 1:
+                print(f"✅ 批量处理完成: {stats['success']} 成功, {stats['failed']} 失败")
+            # V3.9.2: 为 RAF/ORF 文件创建 XMP 侧车文件
+            self._create_xmp_sidecars_for_raf(self._written_items(files_metadata, written))
+            return stats
+
+        # ExifTool批量模式：使用 -execute 分隔符为每个文件单独设置参数
+        # V3.9.1: 改用 XMP 字段，XMP 原生支持 UTF-8 中文
+        # V3.9.4: 强制指定编码为 utf8 解决 Windows/Mac 的中文乱码问题
+        cmd = [self.exiftool_path, '-charset', 'utf8']
+        for tags, file_path in remaining:
+            cmd.extend(tags)
             cmd.append(file_path)
             cmd.append('-overwrite_original')  # 放在每个文件之后
 
@@ -280,10 +492,6 @@ class ExifToolManager:
 
         # 执行批量命令
         try:
-            # V3.1.2: 只在处理多个文件时显示消息（单文件处理不显示，避免刷屏）
-            if len(files_metadata) > 1:
-                print(f"📦 批量处理 {len(files_metadata)} 个文件...")
-
             # V3.9.4: 在 Windows 上隐藏控制台窗口
             creationflags = subprocess.CREATE_NO_WINDOW if sys.platform.startswith('win') else 0
             
@@ -297,24 +505,31 @@ class ExifToolManager:
             )
 
             if result.returncode == 0:
-                stats['success'] = len(files_metadata) - stats['failed']
+                stats['success'] += len(remaining)
                 # V3.1.2: 只在处理多个文件时显示完成消息
                 if len(files_metadata) > 1:
                     print(f"✅ 批量处理完成: {stats['success']} 成功, {stats['failed']} 失败")
                 
                 # V3.9.2: 为 RAF/ORF 文件创建 XMP 侧车文件
                 # Lightroom 无法读取嵌入在这些格式中的 XMP，需要侧车文件
-                self._create_xmp_sidecars_for_raf(files_metadata)
+                written.extend(file_path for _, file_path in remaining)
+                self._create_xmp_sidecars_for_raf(self._written_items(files_metadata, written))
             else:
                 print(f"❌ 批量处理失败: {result.stderr}")
-                stats['failed'] = len(files_metadata)
+                stats['failed'] += len(remaining)
 
         except Exception as e:
             print(f"❌ 批量处理异常: {e}")
-            stats['failed'] = len(files_metadata)
+            stats['failed'] += len(remaining)
 
         return stats
     
+    @staticmethod
+    def _written_items(files_metadata: List[Dict[str, any]], written: List[str]) -> List[Dict[str, any]]:
+        """筛出写入成功的条目（写入失败的文件不创建侧车，避免侧车与 RAW 内容不一致）"""
+        written = set(written)
+        return [item for item in files_metadata if item.get('file') in written]
+
     def _create_xmp_sidecars_for_raf(self, files_metadata: List[Dict[str, any]]):
         """
         V3.9.2: 为 RAF/ORF 等需要侧车文件的格式创建 XMP 文件
@@ -596,12 +811,17 @@ class ExifToolManager:
                     manifest = json.load(f)
                 
                 files = manifest.get('files', [])
+                # 缺少 folder 的条目（早期 1.1 manifest）由 rating + folder_structure 推导
+                folder_structure = manifest.get('folder_structure', {})
                 if files:
                     log(f"\n📂 从 manifest 恢复 {len(files)} 个文件...")
                     
                     for file_info in files:
                         filename = file_info['filename']
-                        folder = file_info['folder']
+                        folder = file_info.get('folder')
+                        if folder is None:
+                            rating = file_info.get('rating')
+                            folder = folder_structure.get(str(rating)) or RATING_FOLDER_NAMES.get(rating, "0星_放弃")
                         
                         src_path = os.path.join(dir_path, folder, filename)
                         dst_path = os.path.join(dir_path, filename)
@@ -34,6 +34,23 @@ def raw_to_jpeg(raw_file_path):
     except Exception as e:
         log_message(f"Error occurred while converting the RAW file:{raw_file_path}, Error: {e}", directory_path)
 
+def convert_raw_task(args):
+    """
+    RAW 转换任务（模块级函数，可被 ProcessPoolExecutor pickle 到子进程执行）
+
+    Args:
+        args: (文件前缀, RAW 路径)
+
+    Returns:
+        (文件前缀, 是否成功, 错误信息)
+    """
+    key, raw_path = args
+    try:
+        raw_to_jpeg(raw_path)
+        return (key, True, None)
+    except Exception as e:
+        return (key, False, str(e))
+
 def reset(directory, log_callback=None, i18n=None):
     """
     重置工作目录：
@@ -12,6 +12,9 @@ import subprocess
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+# 查找缓存中"无此翻译"的标记
+_MISSING = object()
+
 
 class I18n:
     """国际化管理器"""
@@ -25,6 +28,8 @@ class I18n:
         """
         self.locales_dir = Path(__file__).parent / "locales"
         self.translations: Dict[str, Any] = {}
+        self._lookup_cache: Dict[str, Any] = {}  # key -> 查找结果（切换语言时清空）
+        self._available_languages: Optional[Dict[str, str]] = None  # 语言包扫描结果（首次调用时填充）
         self.current_lang = default_lang or self._detect_system_language()
         self.fallback_lang = "en_US"  # 找不到翻译时使用英文
 
@@ -78,6 +83,7 @@ class I18n:
 
     def _load_translations(self) -> None:
         """加载当前语言的翻译"""
+        self._lookup_cache.clear()
         locale_file = self.locales_dir / f"{self.current_lang}.json"
 
         if not locale_file.exists():
@@ -115,17 +121,15 @@ class I18n:
             >>> i18n.t("logs.batch_progress", start=1, end=50, success=45)
             "批次 1-50: 45 成功"
         """
-        # 按点号分割key，支持嵌套
-        keys = key.split('.')
-        value = self.translations
+        # 嵌套查找结果按 key 缓存，重复调用只需一次字典命中
+        try:
+            value = self._lookup_cache[key]
+        except KeyError:
+            value = self._lookup_cache[key] = self._lookup(key)
 
-        # 逐级查找
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                # 找不到翻译，返回key本身（便于调试）
-                return key
+        if value is _MISSING:
+            # 找不到翻译，返回key本身（便于调试）
+            return key
 
         # 如果value是字符串，进行参数替换
         if isinstance(value, str):
@@ -137,6 +141,16 @@ class I18n:
         else:
             return str(value)
 
+    def _lookup(self, key: str) -> Any:
+        """按点号分割key逐级查找，找不到返回 _MISSING"""
+        value = self.translations
+        for k in key.split('.'):
+            if isinstance(value, dict) and k in value:
+                value = value[k]
+            else:
+                return _MISSING
+        return value
+
     def switch_language(self, lang: str) -> bool:
         """
         切换语言（需要重启应用生效）
@@ -163,6 +177,13 @@ class I18n:
         Returns:
             {语言代码: 语言名称} 字典
         """
+        # 语言包随程序发布，运行期不会变化，只扫描一次目录
+        if self._available_languages is None:
+            self._available_languages = self._scan_available_languages()
+        return dict(self._available_languages)
+
+    def _scan_available_languages(self) -> Dict[str, str]:
+        """扫描 locales 目录，读取每个语言包的语言名称"""
         languages = {}
 
         if not self.locales_dir.exists():
@@ -21,11 +21,8 @@ multiprocessing.freeze_support()
 # 确保模块路径正确
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon
-
-from ui.main_window import SuperPickyMainWindow
+# 注意：PySide6 / 主窗口在 main() 中导入。spawn 模式下 RAW 转换等子进程会重新执行
+# 本文件的顶层代码，顶层只保留轻量导入，子进程无需加载 Qt 和整套 UI/模型模块
 
 # V3.9.3: 全局窗口引用，防止重复创建
 _main_window = None
@@ -34,6 +31,11 @@ _main_window = None
 def main():
     """主函数"""
     global _main_window
+
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtGui import QIcon
+
+    from ui.main_window import SuperPickyMainWindow
     
     # V3.9.3: 检查是否已有 QApplication 实例
     app = QApplication.instance()
@@ -8,6 +8,8 @@ SuperPicky V3.3 - Re-Star Engine
 
 import os
 import csv
+import heapq
+import numpy as np
 from typing import List, Dict, Set, Optional, Tuple
 from constants import RAW_EXTENSIONS, JPG_EXTENSIONS, IMAGE_EXTENSIONS
 
@@ -154,40 +156,40 @@ class PostAdjustmentEngine:
         Returns:
             新的照片数据列表（含新星级）
         """
-        new_photos = []
+        n = len(photos)
+        conf = np.empty(n, dtype=np.float64)
+        sharpness = np.empty(n, dtype=np.float64)
+        nima = np.empty(n, dtype=np.float64)  # NaN 表示无美学分数
 
-        for photo in photos:
+        for i, photo in enumerate(photos):
             # V4.1: 使用调整后的锐度和美学（如果存在），否则使用原始值
             # 调整后的值包含对焦权重和飞鸟加成，确保重新评星与原始处理一致
-            conf = safe_float(photo.get('confidence'), 0.0)
+            conf[i] = safe_float(photo.get('confidence'), 0.0)
             
             # 优先使用 adj_sharpness，否则使用 head_sharp
             adj_sharpness = safe_float(photo.get('adj_sharpness'), None)
-            sharpness = adj_sharpness if adj_sharpness else safe_float(photo.get('head_sharp'), 0.0)
+            sharpness[i] = adj_sharpness if adj_sharpness else safe_float(photo.get('head_sharp'), 0.0)
             
             # 优先使用 adj_topiq，否则使用 nima_score
             adj_topiq = safe_float(photo.get('adj_topiq'), None)
             nima_score = adj_topiq if adj_topiq else safe_float(photo.get('nima_score'), None)
+            nima[i] = np.nan if nima_score is None else nima_score
+
+        # 整批向量化判定星级（NaN 参与比较恒为 False，等价于"无美学分数"）
+        # 0星判定（技术质量差）
+        star_0 = (conf < min_confidence) | (nima < min_nima) | (sharpness < min_sharpness)
+        sharpness_ok = sharpness >= sharpness_threshold
+        nima_ok = nima >= nima_threshold
+        ratings = np.where(
+            star_0, 0,
+            np.where(sharpness_ok & nima_ok, 3,          # 3星（优选：锐度和美学双达标）
+                     np.where(sharpness_ok | nima_ok, 2,  # 2星（良好：锐度或美学达标其一）
+                              1))                         # 1星（普通）
+        )
 
-            # 判定星级
-            # 0星判定（技术质量差）
-            if conf < min_confidence or \
-               (nima_score is not None and nima_score < min_nima) or \
-               sharpness < min_sharpness:
-                rating = 0
-            # 3星判定（优选：锐度和美学双达标）
-            elif sharpness >= sharpness_threshold and \
-                 (nima_score is not None and nima_score >= nima_threshold):
-                rating = 3
-            # 2星判定（良好：锐度或美学达标其一）
-            elif sharpness >= sharpness_threshold or \
-                 (nima_score is not None and nima_score >= nima_threshold):
-                rating = 2
-            # 1星（普通）
-            else:
-                rating = 1
-
-            # 添加新星级到数据
+        # 添加新星级到数据
+        new_photos = []
+        for photo, rating in zip(photos, ratings.tolist()):
             photo_copy = photo.copy()
             photo_copy['新星级'] = rating
             new_photos.append(photo_copy)
@@ -225,12 +227,13 @@ class PostAdjustmentEngine:
         if len(photos_with_nima) == 0:
             return set()
 
-        sorted_by_nima = sorted(
+        # heapq.nlargest: O(N log K)，无需排序整个列表（结果与 sorted(reverse=True)[:K] 一致）
+        top_by_nima = heapq.nlargest(
+            top_count,
             photos_with_nima,
-            key=lambda x: safe_float(x.get('nima_score'), 0.0),
-            reverse=True
+            key=lambda x: safe_float(x.get('nima_score'), 0.0)
         )
-        nima_top_files = set([photo['filename'] for photo in sorted_by_nima[:top_count]])
+        nima_top_files = {photo['filename'] for photo in top_by_nima}
 
         # 按锐度排序，取Top N%（V3.3: 使用新列名 head_sharp）
         photos_with_sharpness = [
@@ -238,12 +241,12 @@ class PostAdjustmentEngine:
             if safe_float(p.get('head_sharp'), 0.0) > 0
         ]
         
-        sorted_by_sharpness = sorted(
+        top_by_sharpness = heapq.nlargest(
+            top_count,
             photos_with_sharpness,
-            key=lambda x: safe_float(x.get('head_sharp'), 0.0),
-            reverse=True
+            key=lambda x: safe_float(x.get('head_sharp'), 0.0)
         )
-        sharpness_top_files = set([photo['filename'] for photo in sorted_by_sharpness[:top_count]])
+        sharpness_top_files = {photo['filename'] for photo in top_by_sharpness}
 
         # 计算交集（同时在美学和锐度Top N%中的照片）
         picked_files = nima_top_files & sharpness_top_files
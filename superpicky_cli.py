@@ -142,6 +142,7 @@ def cmd_process(args):
     print(f"⚙️  连拍检测: {'是' if args.burst else '否'}")
     print(f"⚙️  整理文件: {'是' if args.organize else '否'}")
     print(f"⚙️  清理临时: {'是' if args.cleanup else '否'}")
+    print(f"⚙️  解码设备: {args.decode_device}")
     print()
     
     # 创建处理器
@@ -157,7 +158,8 @@ def cmd_process(args):
         dir_path=args.directory,
         ui_settings=ui_settings,
         verbose=not args.quiet,
-        detect_flight=args.flight
+        detect_flight=args.flight,
+        decode_device=args.decode_device
     )
     
     # 执行处理
@@ -668,6 +670,8 @@ Examples:
                           help='不清理临时JPG文件')
     p_process.add_argument('-q', '--quiet', action='store_true',
                           help='静默模式')
+    p_process.add_argument('--decode-device', choices=['cpu', 'cuda'], default='cpu',
+                          help='JPEG 解码设备 (默认: cpu; cuda 使用 nvJPEG GPU 解码)')
     # V3.9: 使用 set_defaults 确保 flight, burst 默认为 True
     p_process.set_defaults(organize=True, cleanup=True, burst=True, flight=True)
     
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""pytest 配置：把项目根目录加入 sys.path，测试可直接 import 顶层模块"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
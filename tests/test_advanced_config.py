@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""advanced_config.AdvancedConfig 测试"""
+
+import json
+
+import pytest
+
+from advanced_config import AdvancedConfig
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    return str(tmp_path / "advanced_config.json")
+
+
+def test_update_unknown_key_raises_without_applying(config_file):
+    config = AdvancedConfig(config_file)
+    with pytest.raises(KeyError):
+        config.update(min_sharpness=300, no_such_setting=1)
+    # 先校验全部 key，未知 key 时已知项也不生效
+    assert config.min_sharpness == AdvancedConfig.DEFAULT_CONFIG["min_sharpness"]
+
+
+def test_update_clamps_through_setters(config_file):
+    config = AdvancedConfig(config_file)
+    config.update(
+        min_confidence=0.95,
+        min_sharpness="42",
+        min_nima=9,
+        picked_top_percentage=5,
+        exposure_threshold=0.5,
+        language="xx_XX",
+        save_csv=0,
+    )
+    assert config.min_confidence == 0.7
+    assert config.min_sharpness == 100
+    assert config.min_nima == 5.0
+    assert config.picked_top_percentage == 10
+    assert config.exposure_threshold == 0.20
+    assert config.language == AdvancedConfig.DEFAULT_CONFIG["language"]
+    assert config.save_csv is False
+
+
+def test_unsaved_changes_track_file_contents(config_file):
+    config = AdvancedConfig(config_file)
+    assert config.has_unsaved_changes()  # 尚无配置文件
+
+    config.update(min_sharpness=300)
+    assert config.save()
+    assert not config.has_unsaved_changes()
+
+    config.update(min_sharpness=300)
+    assert not config.has_unsaved_changes()
+
+    config.update(min_sharpness=400)
+    assert config.has_unsaved_changes()
+
+
+def test_reset_to_default_is_unsaved(config_file):
+    """恢复默认只改内存，与配置文件不同，保存时必须写盘"""
+    config = AdvancedConfig(config_file)
+    config.update(min_sharpness=300)
+    config.save()
+
+    config.reset_to_default()
+    assert config.has_unsaved_changes()
+
+
+def test_loaded_file_missing_new_keys_is_unsaved(config_file):
+    """旧版本配置文件缺少新增项时，保存一次以补全"""
+    with open(config_file, 'w', encoding='utf-8') as f:
+        json.dump({"min_sharpness": 250}, f)
+    config = AdvancedConfig(config_file)
+    assert config.min_sharpness == 250
+    assert config.has_unsaved_changes()
+
+    assert config.save()
+    assert not AdvancedConfig(config_file).has_unsaved_changes()
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""ai_model 的 YOLO 结果解析测试（不加载真实模型）"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("ultralytics")
+
+import ai_model  # noqa: E402
+from config import config  # noqa: E402
+
+
+class _FakeTensor:
+    """模拟 torch.Tensor 的 .cpu().numpy() 接口"""
+
+    def __init__(self, array):
+        self._array = np.asarray(array)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._array
+
+    def __getitem__(self, index):
+        return _FakeTensor(self._array[index])
+
+
+class _FakeResult:
+    def __init__(self, box, mask):
+        self.boxes = type("Boxes", (), {})()
+        self.boxes.xyxy = _FakeTensor([box])
+        self.boxes.conf = _FakeTensor([0.9])
+        self.boxes.cls = _FakeTensor([config.ai.BIRD_CLASS_ID])
+        self.masks = type("Masks", (), {})()
+        self.masks.data = _FakeTensor(mask[None].astype(np.float32))
+
+
+def _letterbox_mask(height, width, canvas, box):
+    """按 Ultralytics 居中 letterbox 规则，把图像坐标系的矩形掩码画到方形画布上"""
+    gain = min(canvas / height, canvas / width)
+    pad_h = (canvas - height * gain) / 2
+    pad_w = (canvas - width * gain) / 2
+    x1, y1, x2, y2 = box
+    mask = np.zeros((canvas, canvas), dtype=np.float32)
+    mask[int(pad_h + y1 * gain):int(pad_h + y2 * gain),
+         int(pad_w + x1 * gain):int(pad_w + x2 * gain)] = 1.0
+    return mask
+
+
+@pytest.mark.parametrize("height, width", [(400, 600), (600, 400)])
+def test_mixed_batch_mask_is_unletterboxed(tmp_path, height, width):
+    """横竖混排的一批图片共用方形画布时，掩码仍与各自的图像对齐"""
+    box = (100, 50, 300, 250)
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    result = _FakeResult(box, _letterbox_mask(height, width, 640, box))
+
+    parsed = ai_model.parse_yolo_result(str(tmp_path / "a.jpg"), image, result, str(tmp_path))
+
+    bird_mask = parsed[7]
+    assert bird_mask.shape == (height, width)
+    ys, xs = np.nonzero(bird_mask)
+    x1, y1, x2, y2 = box
+    assert abs(xs.min() - x1) <= 2 and abs(xs.max() + 1 - x2) <= 2
+    assert abs(ys.min() - y1) <= 2 and abs(ys.max() + 1 - y2) <= 2
+
+
+def test_unletterbox_mask_keeps_matching_shape():
+    mask = np.ones((30, 40), dtype=np.float32)
+    assert ai_model.unletterbox_mask(mask, 30, 40) is mask
+
+
+def _write_rotated_jpeg(path):
+    """写一张 EXIF Orientation=6（需顺时针旋转 90°）的横幅 JPEG"""
+    Image = pytest.importorskip("PIL.Image")
+    img = Image.new("RGB", (320, 200), (200, 80, 40))
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    img.save(path, exif=exif.tobytes())
+
+
+def test_gpu_decode_matches_cpu_orientation(tmp_path):
+    """GPU 解码与 cv2.imread 一样应用 EXIF 方向，输出 3 通道"""
+    torch = pytest.importorskip("torch")
+    if not torch.cuda.is_available():
+        pytest.skip("需要 CUDA")
+    path = str(tmp_path / "rotated.jpg")
+    _write_rotated_jpeg(path)
+
+    cpu = ai_model.preprocess_image(path, target_size=160, device='cpu')
+    gpu = ai_model._decode_jpeg_cuda(path, 160)
+
+    assert cpu.shape[0] > cpu.shape[1]  # 已应用旋转：竖幅
+    assert gpu.shape == cpu.shape
+
+
+class _StaticBatchModel:
+    """模拟 INT8 OpenVINO 静态图：输入多于一张时形状不匹配"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, images, device=None, classes=None):
+        self.calls.append(len(images))
+        if len(images) != 1:
+            raise RuntimeError("Input shape mismatch: expected [1,3,1024,1024]")
+        return [("result", id(images[0]))]
+
+
+def test_int8_batch_runs_one_image_per_forward(tmp_path):
+    """N>1 的一批图片经 INT8 路径推理时逐张前向，结果与输入一一对应"""
+    model = _StaticBatchModel()
+    images = [np.zeros((8, 8, 3), dtype=np.uint8) for _ in range(5)]
+
+    results = ai_model.run_yolo_batch(
+        model, images, str(tmp_path), ai_model.yolo_batch_limit("int8")
+    )
+
+    assert results == [("result", id(image)) for image in images]
+    assert model.calls == [1] * 5
+
+
+def test_fp32_batch_is_not_split(tmp_path):
+    model = _StaticBatchModel()
+    images = [np.zeros((8, 8, 3), dtype=np.uint8) for _ in range(3)]
+    assert ai_model.yolo_batch_limit("fp32") is None
+    # 静态图收到整批输入会失败（MPS、CPU 都失败）→ None
+    assert ai_model.run_yolo_batch(model, images, str(tmp_path)) is None
+    assert model.calls == [3, 3]
+
+
+class _CountingModel:
+    def __init__(self, fail=False):
+        self.devices = []
+        self.fail = fail
+
+    def __call__(self, image, device=None, classes=None, verbose=None):
+        self.devices.append(device)
+        if self.fail:
+            raise RuntimeError("MPS backend out of memory")
+
+
+def test_warm_up_skipped_without_mps(monkeypatch):
+    monkeypatch.setattr(ai_model, "_mps_available", lambda: False)
+    model = _CountingModel()
+    ai_model._warm_up_model(model)
+    assert model.devices == []
+
+
+def test_warm_up_runs_once_on_mps_and_logs_failure(monkeypatch, capsys):
+    monkeypatch.setattr(ai_model, "_mps_available", lambda: True)
+    model = _CountingModel()
+    ai_model._warm_up_model(model)
+    assert model.devices == ['mps'] * ai_model.YOLO_WARMUP_RUNS == ['mps']
+
+    failing = _CountingModel(fail=True)
+    ai_model._warm_up_model(failing)
+    assert failing.devices == ['mps']  # 不再回退到 CPU 预热
+    assert "MPS backend out of memory" in capsys.readouterr().out
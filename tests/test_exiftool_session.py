@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""exiftool 常驻会话协议测试（用假进程代替真实 exiftool）"""
+
+import os
+import subprocess
+import threading
+
+import pytest
+
+import exiftool_manager
+from exiftool_manager import ExifToolManager, _write_succeeded
+
+
+class _FakeStdin:
+    """收集参数行，遇到 -executeN 时交给 FakeExifTool 应答"""
+
+    def __init__(self, proc):
+        self._proc = proc
+        self._buffer = b''
+
+    def write(self, data):
+        self._buffer += data
+        while b'\n' in self._buffer:
+            line, self._buffer = self._buffer.split(b'\n', 1)
+            self._proc.feed(line.decode('utf-8'))
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeExifTool:
+    """
+    模拟 exiftool -stay_open：收到 -executeN 后把 respond(args) 的输出和 {readyN} 写到 stdout
+    respond 返回 None 时模拟卡死（不输出 ready 标记）
+    """
+
+    def __init__(self, respond):
+        self._respond = respond
+        self._args = []
+        read_fd, write_fd = os.pipe()
+        self.stdout = os.fdopen(read_fd, 'rb')
+        self._writer = os.fdopen(write_fd, 'wb')
+        self.stdin = _FakeStdin(self)
+        self.returncode = None
+
+    def feed(self, line):
+        if line.startswith('-execute'):
+            args, self._args = self._args, []
+            output = self._respond(args)
+            if output is not None:
+                self._writer.write(output.encode('utf-8') + f"{{ready{line[8:]}}}\n".encode())
+                self._writer.flush()
+        elif line in ('-stay_open', 'False'):
+            if line == 'False':
+                self.kill()
+        else:
+            self._args.append(line)
+
+    def poll(self):
+        return self.returncode
+
+    def kill(self):
+        if self.returncode is None:
+            self.returncode = -9
+            self._writer.close()
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+
+def _updated(args):
+    return "    1 image files updated\n"
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(ExifToolManager, '_get_exiftool_path', lambda self: 'exiftool')
+    monkeypatch.setattr(ExifToolManager, '_verify_exiftool', lambda self: True)
+    return ExifToolManager()
+
+
+def _use_fake(monkeypatch, respond):
+    """让 start_session 启动假进程，返回已启动的假进程列表"""
+    started = []
+
+    def popen(*args, **kwargs):
+        started.append(FakeExifTool(respond))
+        return started[-1]
+
+    monkeypatch.setattr(exiftool_manager.subprocess, 'Popen', popen)
+    return started
+
+
+@pytest.mark.parametrize("output, ok", [
+    ("    1 image files updated\n", True),
+    ("    1 image files unchanged\n", True),
+    ("Error: File not found - a.jpg\n    0 image files updated\n    1 files weren't updated due to errors\n", False),
+    ("Warning: [minor] Bad MakerNotes - a.jpg\n    0 image files updated\n    1 files weren't updated due to errors\n", False),
+    ("Warning: Tag 'XMP:Foo' is not defined\nNothing to do.\n", False),
+    ("", False),
+])
+def test_write_succeeded(output, ok):
+    assert _write_succeeded(output) is ok
+
+
+def test_session_execute_reads_until_ready(manager, monkeypatch):
+    _use_fake(monkeypatch, lambda args: "line for " + args[-1] + "\n")
+    assert manager.start_session()
+    try:
+        assert manager._session_execute(['-XMP:Rating=3', 'a.jpg']) == "line for a.jpg\n"
+        assert manager._session_execute(['-XMP:Rating=1', 'b.jpg']) == "line for b.jpg\n"
+    finally:
+        manager.close_session()
+    assert manager._session_execute(['c.jpg']) is None
+
+
+def test_session_timeout_kills_and_restarts(manager, monkeypatch):
+    def respond(args):
+        return None if args[-1] == 'hang.jpg' else _updated(args)
+
+    started = _use_fake(monkeypatch, respond)
+    assert manager.start_session()
+    try:
+        with pytest.raises(TimeoutError):
+            manager._session_execute(['hang.jpg'], timeout=0.2)
+        assert len(started) == 2
+        assert started[0].poll() is not None
+        assert manager._session_execute(['ok.jpg']) == _updated(None)
+    finally:
+        manager.close_session()
+
+
+def test_session_exit_returns_none(manager, monkeypatch):
+    def respond(args):
+        started[0].kill()  # 处理命令时进程退出
+        return None
+
+    started = _use_fake(monkeypatch, respond)
+    assert manager.start_session()
+    assert manager._session_execute(['a.jpg']) is None
+    assert manager._session is None
+    # 已退出的会话不再使用
+    assert manager._session_execute(['b.jpg']) is None
+
+
+def test_batch_set_metadata_counts(manager, monkeypatch, tmp_path):
+    def respond(args):
+        name = os.path.basename(args[-2])
+        if name == 'bad.jpg':
+            return "Warning: Bad format - bad.jpg\n    0 image files updated\n    1 files weren't updated due to errors\n"
+        if name == 'hang.jpg':
+            return None
+        return _updated(args)
+
+    _use_fake(monkeypatch, respond)
+    monkeypatch.setattr(exiftool_manager, 'SESSION_COMMAND_TIMEOUT', 0.2)
+    names = ['Error shot.jpg', 'bad.jpg', 'hang.jpg', 'ok.jpg']
+    for name in names:
+        (tmp_path / name).write_bytes(b'')
+    assert manager.start_session()
+    try:
+        stats = manager.batch_set_metadata([{'file': str(tmp_path / n), 'rating': 3} for n in names])
+    finally:
+        manager.close_session()
+    assert stats == {'success': 2, 'failed': 2}
+
+
+def test_concurrent_callers_do_not_interleave(manager, monkeypatch):
+    _use_fake(monkeypatch, lambda args: "".join(f"{a}\n" for a in args))
+    assert manager.start_session()
+    errors = []
+
+    def worker(tag):
+        for i in range(50):
+            args = [f"{tag}-{i}-{j}" for j in range(5)]
+            if manager._session_execute(args) != "".join(f"{a}\n" for a in args):
+                errors.append((tag, i))
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in "abcd"]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        manager.close_session()
+    assert errors == []
+
+
+def _record_sidecars(manager, monkeypatch):
+    sidecars = []
+    monkeypatch.setattr(
+        manager, '_create_xmp_sidecars_for_raf',
+        lambda items: sidecars.extend(os.path.basename(item['file']) for item in items)
+    )
+    return sidecars
+
+
+def test_sidecars_only_for_written_files(manager, monkeypatch, tmp_path):
+    def respond(args):
+        if os.path.basename(args[-2]) == 'bad.RAF':
+            return "Error: Not a valid RAF - bad.RAF\n    0 image files updated\n    1 files weren't updated due to errors\n"
+        return _updated(args)
+
+    _use_fake(monkeypatch, respond)
+    sidecars = _record_sidecars(manager, monkeypatch)
+    names = ['good.RAF', 'bad.RAF']
+    for name in names:
+        (tmp_path / name).write_bytes(b'')
+    assert manager.start_session()
+    try:
+        stats = manager.batch_set_metadata([{'file': str(tmp_path / n), 'rating': 3} for n in names])
+    finally:
+        manager.close_session()
+    assert stats == {'success': 1, 'failed': 1}
+    assert sidecars == ['good.RAF']
+
+
+def test_closed_session_falls_back_to_single_run(manager, monkeypatch, tmp_path):
+    """会话已关闭时由 _session_execute 在锁内判断，整批回退到单次 exiftool 调用"""
+    runs = []
+
+    def fake_run(cmd, **kwargs):
+        runs.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout='', stderr='')
+
+    monkeypatch.setattr(exiftool_manager.subprocess, 'run', fake_run)
+    sidecars = _record_sidecars(manager, monkeypatch)
+    path = tmp_path / 'a.ORF'
+    path.write_bytes(b'')
+
+    stats = manager.batch_set_metadata([{'file': str(path), 'rating': 2}])
+
+    assert stats == {'success': 1, 'failed': 0}
+    assert len(runs) == 1 and str(path) in runs[0]
+    assert sidecars == ['a.ORF']
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""core.io_backend 批量移动/删除测试"""
+
+import ctypes
+import errno
+
+import pytest
+
+from core import io_backend
+from core.io_backend import (
+    move_files, remove_files,
+    MOVE_OK, MOVE_EXISTS, MOVE_FAILED,
+    REMOVE_OK, REMOVE_MISSING, REMOVE_FAILED,
+)
+
+
+def _make(path, content="x"):
+    path.write_text(content)
+    return str(path)
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    return src, dst
+
+
+def _run_cases(src, dst):
+    """移动成功 / 目标已存在 / 源不存在 三种情况，结果顺序与 tasks 一致"""
+    tasks = [
+        (_make(src / "a.jpg"), str(dst / "a.jpg")),
+        (_make(src / "b.jpg", "new"), _make(dst / "b.jpg", "old")),
+        (str(src / "missing.jpg"), str(dst / "missing.jpg")),
+    ]
+    results = move_files(tasks)
+    assert [status for status, _ in results] == [MOVE_OK, MOVE_EXISTS, MOVE_FAILED]
+    assert results[2][1]
+    assert (dst / "a.jpg").exists() and not (src / "a.jpg").exists()
+    # 目标已存在时不覆盖，源文件保留
+    assert (dst / "b.jpg").read_text() == "old"
+    assert (src / "b.jpg").read_text() == "new"
+
+
+def test_move_files_rename_path(dirs):
+    _run_cases(*dirs)
+
+
+def test_move_files_shutil_fallback(dirs, monkeypatch):
+    """平台不支持不覆盖重命名时走 shutil.move，语义不变"""
+    monkeypatch.setattr(io_backend, "_get_rename_noreplace", lambda: None)
+    monkeypatch.setattr(io_backend.os, "name", "posix")
+    _run_cases(*dirs)
+
+
+def test_move_files_exdev_falls_back(dirs, monkeypatch):
+    """跨设备 (EXDEV) 时回退到 shutil.move"""
+    def cross_device(src, dst):
+        ctypes.set_errno(errno.EXDEV)
+        return -1
+
+    monkeypatch.setattr(io_backend, "_get_rename_noreplace", lambda: cross_device)
+    monkeypatch.setattr(io_backend.os, "name", "posix")
+    src, dst = dirs
+    results = move_files([(_make(src / "a.jpg"), str(dst / "a.jpg"))])
+    assert results == [(MOVE_OK, None)]
+    assert (dst / "a.jpg").exists()
+
+
+def test_move_files_many_keeps_order(dirs):
+    src, dst = dirs
+    tasks = [(_make(src / f"{i}.jpg"), str(dst / f"{i}.jpg")) for i in range(20)]
+    _make(dst / "7.jpg")
+    statuses = [status for status, _ in move_files(tasks)]
+    assert statuses[7] == MOVE_EXISTS
+    assert statuses.count(MOVE_OK) == 19
+
+
+def test_move_files_empty():
+    assert move_files([]) == []
+
+
+def test_remove_files(tmp_path):
+    (tmp_path / "subdir").mkdir()
+    paths = [_make(tmp_path / "a.tmp"), str(tmp_path / "gone.tmp"), str(tmp_path / "subdir")]
+    statuses = [status for status, _ in remove_files(paths)]
+    assert statuses == [REMOVE_OK, REMOVE_MISSING, REMOVE_FAILED]
+    assert not (tmp_path / "a.tmp").exists()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""core.photo_batch 精选排名测试（与旧版稳定排序逐一比对）"""
+
+import random
+
+import numpy as np
+import pytest
+
+from core.photo_batch import PhotoBatch, top_k_positions
+
+
+def _baseline_picked(photos, top_count):
+    """旧版 _calculate_picked_flags：稳定降序排序后取前 K，再求交集"""
+    by_nima = sorted(photos, key=lambda x: x['nima'], reverse=True)
+    by_sharp = sorted(photos, key=lambda x: x['sharpness'], reverse=True)
+    return ({p['file'] for p in by_nima[:top_count]}
+            & {p['file'] for p in by_sharp[:top_count]})
+
+
+def _fill(batch, rows):
+    for i, (rating, nima, sharpness) in enumerate(rows):
+        batch.files[i] = f"/photos/{i:04d}.jpg"
+        batch.rating[i] = rating
+        batch.nima[i] = np.nan if nima is None else nima
+        batch.sharpness[i] = sharpness
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_picked_matches_baseline_sort(seed):
+    rng = random.Random(seed)
+    size = rng.randint(1, 60)
+    # 取值空间很小，制造大量并列（含 K 边界上的并列）
+    rows = [(rng.choice([1, 2, 3, 3, 3]),
+             rng.choice([None, 4.5, 5.0, 5.5, 6.0]),
+             rng.choice([100.0, 200.0, 300.0]))
+            for _ in range(size)]
+    batch = PhotoBatch.allocate(size)
+    _fill(batch, rows)
+
+    photos = batch.star_3_dicts()
+    if not photos:
+        assert len(batch.star_3_indices()) == 0
+        return
+    top_count = max(1, int(len(photos) * rng.choice([0.1, 0.25, 0.5])))
+
+    picked = {batch.files[i] for i in batch.picked_indices(top_count).tolist()}
+    assert picked == _baseline_picked(photos, top_count)
+
+
+def test_near_equal_scores_are_not_collapsed():
+    """float64 保留相差极小的分数（float32 下会变成并列）"""
+    batch = PhotoBatch.allocate(2)
+    _fill(batch, [(3, 5.0, 100.0), (3, 5.0 + 1e-9, 100.0 + 1e-9)])
+    assert batch.nima[1] > batch.nima[0]
+    assert batch.picked_indices(1).tolist() == [1]
+
+
+def test_top_k_ties_follow_input_order():
+    values = np.array([1.0, 3.0, 2.0, 3.0, 3.0, 0.5])
+    assert top_k_positions(values, 2).tolist() == [1, 3]
+    assert top_k_positions(values, 4).tolist() == [1, 2, 3, 4]
+    assert top_k_positions(values, 10).tolist() == list(range(6))
+    assert top_k_positions(values, 0).tolist() == []
+
+
+def test_unset_rating_and_missing_nima_excluded():
+    batch = PhotoBatch.allocate(3)
+    _fill(batch, [(3, None, 500.0), (2, 9.0, 500.0), (3, 4.0, 100.0)])
+    batch.rating[1] = PhotoBatch.RATING_UNSET
+    assert batch.star_3_indices().tolist() == [2]
+    assert batch.picked_indices(1).tolist() == [2]
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""RatingEngine 阈值修改后特化评分函数的更新测试"""
+
+from core.rating_engine import RatingEngine
+
+
+def _engine():
+    return RatingEngine(
+        min_confidence=0.5,
+        min_sharpness=100,
+        min_nima=4.0,
+        sharpness_threshold=400,
+        nima_threshold=5.0,
+    )
+
+
+def test_min_confidence_assignment_takes_effect():
+    engine = _engine()
+    assert engine.calculate(True, 0.6, 500, topiq=6.0).rating == 3
+
+    engine.min_confidence = 0.7
+
+    assert engine.min_confidence == 0.7
+    assert engine.calculate(True, 0.6, 500, topiq=6.0).rating == 0
+
+
+def test_threshold_assignment_and_update_thresholds():
+    engine = _engine()
+    assert engine.calculate(True, 0.9, 450, topiq=5.5).rating == 3
+
+    engine.sharpness_threshold = 500
+    assert engine.calculate(True, 0.9, 450, topiq=5.5).rating == 2
+
+    engine.update_thresholds(sharpness_threshold=300, nima_threshold=6.0)
+    assert (engine.sharpness_threshold, engine.nima_threshold) == (300, 6.0)
+    assert engine.calculate(True, 0.9, 450, topiq=5.5).rating == 2
+    assert engine.calculate(True, 0.9, 450, topiq=6.5).rating == 3
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""utils 中 EXIF 方向处理的测试（GPU 解码路径靠它对齐 cv2.imread 的方向）"""
+
+import io
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+Image = pytest.importorskip("PIL.Image")
+
+from utils import apply_exif_orientation, read_exif_orientation  # noqa: E402
+
+
+def _write_jpeg(path, orientation):
+    """写一张非对称色块 JPEG（左上红、右上绿、下半蓝），附带 EXIF Orientation"""
+    pixels = np.zeros((120, 200, 3), dtype=np.uint8)
+    pixels[:60, :100] = (255, 0, 0)
+    pixels[:60, 100:] = (0, 255, 0)
+    pixels[60:] = (0, 0, 255)
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    Image.fromarray(pixels).save(path, exif=exif.tobytes(), quality=95)
+
+
+@pytest.mark.parametrize("orientation", range(1, 9))
+def test_apply_matches_cv2_imread(tmp_path, orientation):
+    """未应用方向的解码结果 + apply_exif_orientation == cv2.imread（默认按 EXIF 旋转）"""
+    path = str(tmp_path / f"o{orientation}.jpg")
+    _write_jpeg(path, orientation)
+
+    expected = cv2.imread(path)
+    raw = cv2.imread(path, cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION)
+    assert raw.shape == (120, 200, 3)
+
+    oriented = apply_exif_orientation(raw, read_exif_orientation(path))
+
+    assert oriented.shape == expected.shape
+    assert oriented.flags['C_CONTIGUOUS']
+    assert np.abs(oriented.astype(int) - expected.astype(int)).max() <= 2
+
+
+def test_read_orientation_from_bytes_and_missing_exif(tmp_path):
+    path = tmp_path / "o6.jpg"
+    _write_jpeg(str(path), 6)
+    assert read_exif_orientation(io.BytesIO(path.read_bytes())) == 6
+
+    plain = tmp_path / "plain.jpg"
+    Image.new("RGB", (8, 8)).save(str(plain))
+    assert read_exif_orientation(str(plain)) == 1
+    assert read_exif_orientation(str(tmp_path / "missing.jpg")) == 1
@@ -5,13 +5,16 @@ PySide6 版本 - 极简艺术风格（单页面布局）
 V3.8: 合并两个 Tab 为单页面布局，添加曝光阈值设置
 """
 
+from functools import partial
+
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QSlider, QPushButton, QGroupBox, QComboBox,
-    QWidget, QMessageBox, QFrame, QScrollArea
+    QWidget, QFrame, QScrollArea
 )
-from PySide6.QtCore import Qt, Slot
+from PySide6.QtCore import Qt, Slot, QTimer
 from PySide6.QtGui import QFont
+from shiboken6 import isValid
 
 from advanced_config import get_advanced_config
 from i18n import get_i18n
@@ -19,25 +22,100 @@ from ui.styles import COLORS, FONTS
 from ui.custom_dialogs import StyledMessageBox
 
 
+# 滑块数值标签的刷新间隔（毫秒，约一帧），拖动时合并高频 valueChanged
+SLIDER_LABEL_INTERVAL_MS = 16
+
+# 取值个数不超过该值的滑块，预先生成全部数值文本，刷新时直接查表
+SLIDER_LABEL_TABLE_MAX = 512
+
+
+def _label_from_table(table, min_val, value):
+    """查预生成的数值文本表（替代每次调用 format_func）"""
+    return table[value - min_val]
+
+
+def _refresh_value_label(slider, value_label, format_func):
+    """按滑块当前值刷新数值标签"""
+    value_label.setText(format_func(slider.value()))
+
+
+def _schedule_label_update(label_timer, _value):
+    """valueChanged 槽：定时器空闲时才启动，合并一帧内的多次变化"""
+    if not label_timer.isActive():
+        label_timer.start()
+
+
+# 构建界面用到的翻译 key（打开对话框时一次性解析）
+_UI_STRINGS = (
+    "settings.header_title",
+    "settings.tab_thresholds",
+    "settings.thresholds_desc",
+    "settings.ai_confidence",
+    "settings.min_sharpness",
+    "settings.min_aesthetics",
+    "settings.tab_output",
+    "settings.output_desc",
+    "settings.pick_top_percent",
+    "settings.exposure_threshold",
+    "settings.language_section",
+    "settings.interface_language",
+    "settings.restart_note",
+    "settings.reset_defaults",
+    "settings.cancel",
+    "settings.save",
+)
+
+
 class AdvancedSettingsDialog(QDialog):
     """高级设置对话框 - 极简艺术风格（单页面布局）"""
 
+    # 复用的对话框实例（见 instance()）
+    _inst = None
+
+    @classmethod
+    def instance(cls, parent=None):
+        """
+        获取复用的对话框实例：首次调用时创建，之后每次打开只重新加载配置
+
+        Args:
+            parent: 父窗口（仅创建时生效）
+        """
+        # 父窗口销毁（主窗口重建、测试）时对话框的 C++ 对象随之删除，需要重新创建
+        if cls._inst is None or not isValid(cls._inst):
+            cls._inst = cls(parent)
+        return cls._inst
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.config = get_advanced_config()
         self.i18n = get_i18n(self.config.language)
 
-        self.vars = {}
-
-        self._setup_ui()
-        self._load_current_config()
+        # 滑块控件（_setup_ui 中创建）
+        self.sl_min_confidence = None
+        self.sl_min_sharpness = None
+        self.sl_min_nima = None
+        self.sl_picked_top_percentage = None
+        self.sl_exposure_threshold = None
 
-    def _setup_ui(self):
-        """设置 UI"""
+        # 窗口属性在构造时设置（决定显示位置和模态），控件树推迟到首次显示时构建
         self.setWindowTitle(self.i18n.t("settings.window_title"))
         self.setMinimumSize(520, 620)
         self.resize(540, 680)
         self.setModal(True)
+        self._initialized = False
+
+    def showEvent(self, event):
+        """首次显示时才构建控件；每次显示都从当前配置刷新控件"""
+        if not self._initialized:
+            self._initialized = True
+            self._setup_ui()
+        self._load_current_config()
+        super().showEvent(event)
+
+    def _setup_ui(self):
+        """设置 UI"""
+        # 界面文本一次性解析，构建各区域时直接查本地字典
+        tr = {key: self.i18n.t(key) for key in _UI_STRINGS}
 
         # 应用样式
         self.setStyleSheet(f"""
@@ -120,6 +198,51 @@ class AdvancedSettingsDialog(QDialog):
                 selection-background-color: {COLORS['accent']};
                 selection-color: {COLORS['bg_void']};
             }}
+            QLabel#settingsTitle {{
+                color: {COLORS['text_primary']};
+                font-size: 16px;
+                font-weight: 600;
+            }}
+            QLabel#sectionTitle {{
+                color: {COLORS['text_tertiary']};
+                font-size: 11px;
+                font-weight: 500;
+                letter-spacing: 1px;
+            }}
+            QLabel#sectionDesc {{
+                color: {COLORS['text_tertiary']};
+                font-size: 12px;
+            }}
+            QLabel#settingLabel {{
+                color: {COLORS['text_secondary']};
+                font-size: 13px;
+                min-width: 100px;
+            }}
+            QLabel#sliderValue {{
+                color: {COLORS['accent']};
+                font-size: 14px;
+                font-family: {FONTS['mono']};
+                font-weight: 500;
+                min-width: 50px;
+            }}
+            QLabel#restartNote {{
+                color: {COLORS['warning']};
+                font-size: 11px;
+            }}
+            QScrollArea#settingsScroll, QScrollArea#settingsScroll * {{
+                background: transparent;
+            }}
+            QFrame#divider {{
+                background-color: {COLORS['border_subtle']};
+            }}
+            QFrame#langFrame, QFrame#langFrame QFrame {{
+                background-color: {COLORS['bg_card']};
+                border-radius: 8px;
+            }}
+            QLabel#langLabel {{
+                color: {COLORS['text_secondary']};
+                font-size: 13px;
+            }}
         """)
 
         layout = QVBoxLayout(self)
@@ -127,12 +250,8 @@ class AdvancedSettingsDialog(QDialog):
         layout.setSpacing(0)
 
         # 标题
-        title = QLabel(self.i18n.t("settings.header_title"))
-        title.setStyleSheet(f"""
-            color: {COLORS['text_primary']};
-            font-size: 16px;
-            font-weight: 600;
-        """)
+        title = QLabel(tr["settings.header_title"])
+        title.setObjectName("settingsTitle")
         layout.addWidget(title)
         layout.addSpacing(24)
 
@@ -140,29 +259,28 @@ class AdvancedSettingsDialog(QDialog):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setFrameShape(QFrame.NoFrame)
-        scroll.setStyleSheet("background: transparent;")
+        scroll.setObjectName("settingsScroll")
         
         scroll_content = QWidget()
-        scroll_content.setStyleSheet("background: transparent;")
         scroll_layout = QVBoxLayout(scroll_content)
         scroll_layout.setContentsMargins(0, 0, 0, 0)
         scroll_layout.setSpacing(0)
 
         # 上半区域：0星阈值
-        self._create_threshold_section(scroll_layout)
+        self._create_threshold_section(scroll_layout, tr)
         
         scroll_layout.addSpacing(24)
         
         # 分隔线
         divider = QFrame()
         divider.setFixedHeight(1)
-        divider.setStyleSheet(f"background-color: {COLORS['border_subtle']};")
+        divider.setObjectName("divider")
         scroll_layout.addWidget(divider)
         
         scroll_layout.addSpacing(24)
 
         # 下半区域：输出设置
-        self._create_output_section(scroll_layout)
+        self._create_output_section(scroll_layout, tr)
 
         scroll_layout.addStretch()
         scroll.setWidget(scroll_content)
@@ -171,143 +289,118 @@ class AdvancedSettingsDialog(QDialog):
         layout.addSpacing(24)
 
         # 底部按钮
-        self._create_buttons(layout)
+        self._create_buttons(layout, tr)
 
-    def _create_threshold_section(self, layout):
+    def _create_threshold_section(self, layout, tr):
         """创建 0 星阈值区域"""
         # 区域标题
-        section_title = QLabel(self.i18n.t("settings.tab_thresholds").upper())
-        section_title.setStyleSheet(f"""
-            color: {COLORS['text_tertiary']};
-            font-size: 11px;
-            font-weight: 500;
-            letter-spacing: 1px;
-        """)
+        section_title = QLabel(tr["settings.tab_thresholds"].upper())
+        section_title.setObjectName("sectionTitle")
         layout.addWidget(section_title)
         layout.addSpacing(8)
 
         # 说明
-        desc = QLabel(self.i18n.t("settings.thresholds_desc"))
-        desc.setStyleSheet(f"color: {COLORS['text_tertiary']}; font-size: 12px;")
+        desc = QLabel(tr["settings.thresholds_desc"])
+        desc.setObjectName("sectionDesc")
         desc.setWordWrap(True)
         layout.addWidget(desc)
         layout.addSpacing(16)
 
+        # 同一区域的滑块共用一个网格：标签 | 滑块 | 数值
+        grid = self._create_slider_grid(layout)
+
         # AI 置信度阈值
-        self.vars["min_confidence"] = self._create_slider_setting(
-            layout,
-            self.i18n.t("settings.ai_confidence"),
+        self.sl_min_confidence = self._create_slider_setting(
+            grid, 0,
+            tr["settings.ai_confidence"],
             min_val=30, max_val=70, default=50,
-            format_func=lambda v: f"{v/100:.2f}",
+            format_func=self._fmt_div100,
             scale=100
         )
 
-        layout.addSpacing(12)
-
         # 锐度最低阈值
-        self.vars["min_sharpness"] = self._create_slider_setting(
-            layout,
-            self.i18n.t("settings.min_sharpness"),
+        self.sl_min_sharpness = self._create_slider_setting(
+            grid, 1,
+            tr["settings.min_sharpness"],
             min_val=100, max_val=500, default=100,  # V4.1: 最小调整为100
             step=10
         )
 
-        layout.addSpacing(12)
-
         # 美学最低阈值
-        self.vars["min_nima"] = self._create_slider_setting(
-            layout,
-            self.i18n.t("settings.min_aesthetics"),
+        self.sl_min_nima = self._create_slider_setting(
+            grid, 2,
+            tr["settings.min_aesthetics"],
             min_val=30, max_val=50, default=40,
-            format_func=lambda v: f"{v/10:.1f}",
+            format_func=self._fmt_div10,
             scale=10
         )
 
-    def _create_output_section(self, layout):
+    def _create_output_section(self, layout, tr):
         """创建输出设置区域"""
         # 区域标题
-        section_title = QLabel(self.i18n.t("settings.tab_output").upper())
-        section_title.setStyleSheet(f"""
-            color: {COLORS['text_tertiary']};
-            font-size: 11px;
-            font-weight: 500;
-            letter-spacing: 1px;
-        """)
+        section_title = QLabel(tr["settings.tab_output"].upper())
+        section_title.setObjectName("sectionTitle")
         layout.addWidget(section_title)
         layout.addSpacing(8)
 
         # 说明
-        desc = QLabel(self.i18n.t("settings.output_desc"))
-        desc.setStyleSheet(f"color: {COLORS['text_tertiary']}; font-size: 12px;")
+        desc = QLabel(tr["settings.output_desc"])
+        desc.setObjectName("sectionDesc")
         desc.setWordWrap(True)
         layout.addWidget(desc)
         layout.addSpacing(16)
 
+        grid = self._create_slider_grid(layout)
+
         # 精选旗标百分比
-        self.vars["picked_top_percentage"] = self._create_slider_setting(
-            layout,
-            self.i18n.t("settings.pick_top_percent"),
+        self.sl_picked_top_percentage = self._create_slider_setting(
+            grid, 0,
+            tr["settings.pick_top_percent"],
             min_val=10, max_val=50, default=25,
             step=5,
-            format_func=lambda v: f"{v}%"
+            format_func=self._fmt_percent
         )
 
-        layout.addSpacing(12)
-
         # V3.8: 曝光阈值
-        self.vars["exposure_threshold"] = self._create_slider_setting(
-            layout,
-            self.i18n.t("settings.exposure_threshold"),
+        self.sl_exposure_threshold = self._create_slider_setting(
+            grid, 1,
+            tr["settings.exposure_threshold"],
             min_val=5, max_val=20, default=10,
             step=5,
-            format_func=lambda v: f"{v}%"
+            format_func=self._fmt_percent
         )
 
         layout.addSpacing(20)
 
         # 语言设置
-        lang_section = QLabel(self.i18n.t("settings.language_section").upper())
-        lang_section.setStyleSheet(f"""
-            color: {COLORS['text_tertiary']};
-            font-size: 11px;
-            font-weight: 500;
-            letter-spacing: 1px;
-        """)
+        lang_section = QLabel(tr["settings.language_section"].upper())
+        lang_section.setObjectName("sectionTitle")
         layout.addWidget(lang_section)
         layout.addSpacing(12)
 
         lang_frame = QFrame()
-        lang_frame.setStyleSheet(f"""
-            QFrame {{
-                background-color: {COLORS['bg_card']};
-                border-radius: 8px;
-            }}
-        """)
+        lang_frame.setObjectName("langFrame")
         lang_layout = QHBoxLayout(lang_frame)
         lang_layout.setContentsMargins(16, 12, 16, 12)
 
-        lang_label = QLabel(self.i18n.t("settings.interface_language"))
-        lang_label.setStyleSheet(f"color: {COLORS['text_secondary']}; font-size: 13px;")
+        lang_label = QLabel(tr["settings.interface_language"])
+        lang_label.setObjectName("langLabel")
         lang_layout.addWidget(lang_label)
 
         lang_layout.addStretch()
 
         self.lang_combo = QComboBox()
-        i18n_temp = get_i18n()
-        available_languages = i18n_temp.get_available_languages()
-
-        self.lang_name_to_code = {}
-        self.lang_code_to_name = {}
-        for code, name in available_languages.items():
-            self.lang_name_to_code[name] = code
-            self.lang_code_to_name[code] = name
-            self.lang_combo.addItem(name)
-
-        if self.config.language in self.lang_code_to_name:
-            current_name = self.lang_code_to_name[self.config.language]
-            idx = self.lang_combo.findText(current_name)
-            if idx >= 0:
-                self.lang_combo.setCurrentIndex(idx)
+        available_languages = self.i18n.get_available_languages()
+
+        items = list(available_languages.items())
+        self.lang_code_to_name = dict(items)
+        self.lang_name_to_code = {name: code for code, name in items}
+        # 条目顺序即插入顺序，当前语言的索引直接查表，无需 findText 扫描
+        self.lang_index_by_code = {code: i for i, (code, _) in enumerate(items)}
+        # 一次性批量填充，屏蔽填充过程中的 currentIndexChanged
+        self.lang_combo.blockSignals(True)
+        self.lang_combo.addItems([name for _, name in items])
+        self.lang_combo.blockSignals(False)
 
         lang_layout.addWidget(self.lang_combo)
         layout.addWidget(lang_frame)
@@ -315,54 +408,81 @@ class AdvancedSettingsDialog(QDialog):
         layout.addSpacing(8)
 
         # 提示
-        note = QLabel(self.i18n.t("settings.restart_note"))
-        note.setStyleSheet(f"color: {COLORS['warning']}; font-size: 11px;")
+        note = QLabel(tr["settings.restart_note"])
+        note.setObjectName("restartNote")
         layout.addWidget(note)
 
-    def _create_slider_setting(self, layout, label_text,
+    # 滑块数值格式化（静态函数，避免每个滑块各建一个 lambda）
+    @staticmethod
+    def _fmt_div100(v):
+        return f"{v/100:.2f}"
+
+    @staticmethod
+    def _fmt_div10(v):
+        return f"{v/10:.1f}"
+
+    @staticmethod
+    def _fmt_percent(v):
+        return f"{v}%"
+
+    @staticmethod
+    def _create_slider_grid(layout):
+        """创建一个区域的滑块网格（替代每个滑块各自嵌套一层 QHBoxLayout）"""
+        grid = QGridLayout()
+        grid.setContentsMargins(0, 0, 0, 0)
+        grid.setHorizontalSpacing(16)
+        grid.setVerticalSpacing(12)
+        grid.setColumnStretch(1, 1)
+        layout.addLayout(grid)
+        return grid
+
+    def _create_slider_setting(self, grid, row, label_text,
                                min_val, max_val, default, step=1,
                                format_func=None, scale=1):
-        """创建滑块设置项"""
-        container = QHBoxLayout()
-        container.setSpacing(16)
-
+        """在网格第 row 行创建滑块设置项"""
         label = QLabel(label_text)
-        label.setStyleSheet(f"color: {COLORS['text_secondary']}; font-size: 13px; min-width: 100px;")
-        container.addWidget(label)
+        label.setObjectName("settingLabel")
+        grid.addWidget(label, row, 0)
 
         slider = QSlider(Qt.Horizontal)
         slider.setRange(min_val, max_val)
         slider.setValue(default)
         slider.setSingleStep(step)
-        container.addWidget(slider, 1)
+        # 不绘制刻度（刻度绘制拖慢重绘）；PageUp/PageDown 按范围的 1/10 跳
+        slider.setTickPosition(QSlider.NoTicks)
+        slider.setTracking(True)
+        slider.setPageStep(max(1, (max_val - min_val) // 10))
+        grid.addWidget(slider, row, 1)
 
         if format_func is None:
-            format_func = lambda v: str(v)
+            format_func = str
+        if max_val - min_val <= SLIDER_LABEL_TABLE_MAX:
+            table = tuple(format_func(v) for v in range(min_val, max_val + 1))
+            format_func = partial(_label_from_table, table, min_val)
 
         value_label = QLabel(format_func(default))
-        value_label.setStyleSheet(f"""
-            color: {COLORS['accent']};
-            font-size: 14px;
-            font-family: {FONTS['mono']};
-            font-weight: 500;
-            min-width: 50px;
-        """)
+        value_label.setObjectName("sliderValue")
         value_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        container.addWidget(value_label)
+        grid.addWidget(value_label, row, 2)
 
-        slider.valueChanged.connect(lambda v: value_label.setText(format_func(v)))
-
-        layout.addLayout(container)
+        # 拖动时 valueChanged 触发很密集：合并为每帧最多刷新一次标签（定时器触发时读取最新值）
+        label_timer = QTimer(slider)
+        label_timer.setSingleShot(True)
+        label_timer.setInterval(SLIDER_LABEL_INTERVAL_MS)
+        label_timer.timeout.connect(partial(_refresh_value_label, slider, value_label, format_func))
+        slider.valueChanged.connect(partial(_schedule_label_update, label_timer))
 
         slider.scale = scale
+        slider._value_label = value_label
+        slider._format_func = format_func
         return slider
 
-    def _create_buttons(self, layout):
+    def _create_buttons(self, layout, tr):
         """创建底部按钮"""
         btn_layout = QHBoxLayout()
 
         # 恢复默认
-        reset_btn = QPushButton(self.i18n.t("settings.reset_defaults"))
+        reset_btn = QPushButton(tr["settings.reset_defaults"])
         reset_btn.setObjectName("tertiary")
         reset_btn.clicked.connect(self._reset_to_default)
         btn_layout.addWidget(reset_btn)
@@ -370,14 +490,14 @@ class AdvancedSettingsDialog(QDialog):
         btn_layout.addStretch()
 
         # 取消
-        cancel_btn = QPushButton(self.i18n.t("settings.cancel"))
+        cancel_btn = QPushButton(tr["settings.cancel"])
         cancel_btn.setObjectName("secondary")
         cancel_btn.setMinimumWidth(100)
         cancel_btn.clicked.connect(self.reject)
         btn_layout.addWidget(cancel_btn)
 
         # 保存
-        save_btn = QPushButton(self.i18n.t("settings.save"))
+        save_btn = QPushButton(tr["settings.save"])
         save_btn.setMinimumWidth(100)
         save_btn.clicked.connect(self._save_settings)
         btn_layout.addWidget(save_btn)
@@ -386,20 +506,46 @@ class AdvancedSettingsDialog(QDialog):
 
     def _load_current_config(self):
         """加载当前配置"""
-        self.vars["min_confidence"].setValue(int(self.config.min_confidence * 100))
-        self.vars["min_sharpness"].setValue(int(self.config.min_sharpness))
-        self.vars["min_nima"].setValue(int(self.config.min_nima * 10))
-        self.vars["picked_top_percentage"].setValue(int(self.config.picked_top_percentage))
-        # V3.8: 加载曝光阈值
-        self.vars["exposure_threshold"].setValue(int(self.config.exposure_threshold * 100))
+        values = (
+            (self.sl_min_confidence, int(self.config.min_confidence * 100)),
+            (self.sl_min_sharpness, int(self.config.min_sharpness)),
+            (self.sl_min_nima, int(self.config.min_nima * 10)),
+            (self.sl_picked_top_percentage, int(self.config.picked_top_percentage)),
+            # V3.8: 加载曝光阈值
+            (self.sl_exposure_threshold, int(self.config.exposure_threshold * 100)),
+        )
+        # 屏蔽 valueChanged 批量设值，再直接刷新一次数值标签
+        for slider, value in values:
+            slider.blockSignals(True)
+            slider.setValue(value)
+            slider.blockSignals(False)
+            slider._value_label.setText(slider._format_func(slider.value()))
+
+        # 复用实例时，丢弃上次未保存的语言选择
+        idx = self.lang_index_by_code.get(self.config.language, -1)
+        if idx >= 0:
+            self.lang_combo.setCurrentIndex(idx)
+
+    def _show_message(self, show_func, key_prefix, **kwargs):
+        """
+        按 settings.<key_prefix>_title / _msg 弹出消息框
+
+        Args:
+            show_func: StyledMessageBox.question / information / critical
+            key_prefix: 翻译 key 前缀，如 "save_success"
+        """
+        return show_func(
+            self,
+            self.i18n.t(f"settings.{key_prefix}_title"),
+            self.i18n.t(f"settings.{key_prefix}_msg"),
+            **kwargs
+        )
 
     @Slot()
     def _reset_to_default(self):
         """恢复默认设置"""
-        reply = StyledMessageBox.question(
-            self,
-            self.i18n.t("settings.reset_confirm_title"),
-            self.i18n.t("settings.reset_confirm_msg"),
+        reply = self._show_message(
+            StyledMessageBox.question, "reset_confirm",
             yes_text=self.i18n.t("labels.yes"),
             no_text=self.i18n.t("labels.no")
         )
@@ -407,43 +553,40 @@ class AdvancedSettingsDialog(QDialog):
         if reply == StyledMessageBox.Yes:
             self.config.reset_to_default()
             self._load_current_config()
-            StyledMessageBox.information(
-                self,
-                self.i18n.t("settings.reset_done_title"),
-                self.i18n.t("settings.reset_done_msg")
-            )
+            self._show_message(StyledMessageBox.information, "reset_done")
 
     @Slot()
     def _save_settings(self):
         """保存设置"""
-        min_confidence = self.vars["min_confidence"].value() / 100.0
-        min_sharpness = self.vars["min_sharpness"].value()
-        min_nima = self.vars["min_nima"].value() / 10.0
-        picked_percentage = self.vars["picked_top_percentage"].value()
+        min_confidence = self.sl_min_confidence.value() / 100.0
+        min_sharpness = self.sl_min_sharpness.value()
+        min_nima = self.sl_min_nima.value() / 10.0
+        picked_percentage = self.sl_picked_top_percentage.value()
         # V3.8: 获取曝光阈值
-        exposure_threshold = self.vars["exposure_threshold"].value() / 100.0
-
-        self.config.set_min_confidence(min_confidence)
-        self.config.set_min_sharpness(min_sharpness)
-        self.config.set_min_nima(min_nima)
-        self.config.set_picked_top_percentage(picked_percentage)
-        self.config.set_exposure_threshold(exposure_threshold)
-        self.config.set_save_csv(True)
-
+        exposure_threshold = self.sl_exposure_threshold.value() / 100.0
+
+        values = dict(
+            min_confidence=min_confidence,
+            min_sharpness=min_sharpness,
+            min_nima=min_nima,
+            picked_top_percentage=picked_percentage,
+            exposure_threshold=exposure_threshold,
+            save_csv=True,
+        )
         selected_name = self.lang_combo.currentText()
         if selected_name in self.lang_name_to_code:
-            self.config.set_language(self.lang_name_to_code[selected_name])
+            values["language"] = self.lang_name_to_code[selected_name]
+
+        self.config.update(**values)
+
+        # 经 set_* 钳制/规范化后与配置文件内容一致时无需写盘
+        # （与磁盘比较而非打开对话框时的内存状态：恢复默认后取消再打开仍需写盘）
+        if not self.config.has_unsaved_changes():
+            self.accept()
+            return
 
         if self.config.save():
-            StyledMessageBox.information(
-                self,
-                self.i18n.t("settings.save_success_title"),
-                self.i18n.t("settings.save_success_msg")
-            )
+            self._show_message(StyledMessageBox.information, "save_success")
             self.accept()
         else:
-            StyledMessageBox.critical(
-                self,
-                self.i18n.t("settings.save_error_title"),
-                self.i18n.t("settings.save_error_msg")
-            )
+            self._show_message(StyledMessageBox.critical, "save_error")
@@ -1165,8 +1165,8 @@ class SuperPickyMainWindow(QMainWindow):
     def _show_advanced_settings(self):
         """显示高级设置"""
         from .advanced_settings_dialog import AdvancedSettingsDialog
-        dialog = AdvancedSettingsDialog(self)
-        dialog.exec()
+        # 复用同一个对话框实例，避免每次打开都重建控件树
+        AdvancedSettingsDialog.instance(self).exec()
 
     @Slot()
     def _show_about(self):
@@ -1,11 +1,13 @@
 """
 工具函数模块
-提供日志记录和CSV报告功能
+提供日志记录、CSV报告和 EXIF 方向处理功能
 """
 import os
 import csv
 from datetime import datetime
 
+import numpy as np
+
 
 def log_message(message: str, directory: str = None, file_only: bool = False):
     """
@@ -87,3 +89,47 @@ def write_to_csv(data: dict, directory: str, header: bool = False):
                 writer.writerow(data)
     except Exception as e:
         log_message(f"Warning: Could not write to CSV file: {e}", directory)
+
+
+def read_exif_orientation(source) -> int:
+    """
+    读取 JPEG 的 EXIF Orientation 标签（只解析文件头）
+
+    Args:
+        source: 文件路径或二进制文件对象
+
+    Returns:
+        1-8 的方向值；无 EXIF 或读取失败时返回 1（不旋转）
+    """
+    try:
+        from PIL import Image
+        with Image.open(source) as img:
+            orientation = int(img.getexif().get(0x0112, 1))
+    except Exception:
+        return 1
+    return orientation if 1 <= orientation <= 8 else 1
+
+
+def apply_exif_orientation(img: np.ndarray, orientation: int) -> np.ndarray:
+    """
+    按 EXIF Orientation 旋转/翻转 HWC 图像，结果与 cv2.imread 的默认行为一致
+
+    Args:
+        img: 未应用方向的图像（H×W 或 H×W×C）
+        orientation: EXIF Orientation 值 (1-8)
+    """
+    if orientation == 2:
+        img = img[:, ::-1]
+    elif orientation == 3:
+        img = img[::-1, ::-1]
+    elif orientation == 4:
+        img = img[::-1]
+    elif orientation == 5:
+        img = img.swapaxes(0, 1)
+    elif orientation == 6:
+        img = np.rot90(img, k=-1)
+    elif orientation == 7:
+        img = img[::-1, ::-1].swapaxes(0, 1)
+    elif orientation == 8:
+        img = np.rot90(img, k=1)
+    return np.ascontiguousarray(img)